@@ -1,9 +1,90 @@
-import os
+import copy
 import json
-import pandas as pd
+import time
+import asyncio
+import hashlib
+import heapq
 import datetime
+import functools
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
+from google.oauth2 import service_account
+
+# 이 행 수를 넘는 결과는 REST 대신 BigQuery Storage Read API(Arrow)로 읽음
+_STORAGE_API_ROW_THRESHOLD = 10_000
+
+# 통합 분석 쿼리의 kind 별 결과 컬럼
+_ANALYTICS_COLUMNS = {
+    "ga": ("page_path", "sessions", "users", "avg_time_seconds", "events"),
+    "time": ("page_path", "avg_time_seconds"),
+    "bounce": ("page_path", "bounce_rate"),
+}
+
+# 심각도별 정렬 가중치
+_SEVERITY_VALUE = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+
+# 접근성 감사(axe) impact -> 보고서 심각도
+_IMPACT_TO_SEVERITY = {"critical": "critical", "serious": "high", "moderate": "medium", "minor": "low"}
+
+# 심각도 -> 보고서 요약 카운터 키
+_SEVERITY_SUMMARY_KEY = {
+    "critical": "critical_issues",
+    "high": "high_priority_issues",
+    "medium": "medium_priority_issues",
+    "low": "low_priority_issues",
+}
+
+# 이슈 유형 -> (권장 사항 제목 접두어, 설명, 기대 효과)
+# 설명의 {help_url}은 이슈의 helpUrl로 치환됨
+_RECOMMENDATION_TEMPLATES = {
+    "performance": (
+        "성능 최적화",
+        "페이지 로드 시간을 개선하기 위해 이미지 최적화, 자바스크립트 최소화, 중요하지 않은 리소스 지연 로딩 등의 기법을 적용하세요.",
+        "높음"
+    ),
+    "accessibility": (
+        "접근성 개선",
+        "WCAG 지침에 따라 해당 접근성 문제를 수정하세요. 관련 도움말: {help_url}",
+        "높음"
+    ),
+    "usability": (
+        "사용성 개선",
+        "모든 대화형 요소가 충분한 크기와 적절한 간격을 가지도록 개선하세요. 특히 모바일 사용자를 위한 최소 44x44 픽셀 크기를 권장합니다.",
+        "중간"
+    ),
+    "journey_error": (
+        "사용자 여정 개선",
+        "사용자가 목표를 달성하는 과정에서 발생한 오류를 수정하세요. 명확한 오류 메시지와 복구 경로를 제공하는 것이 중요합니다.",
+        "높음"
+    ),
+}
+_DEFAULT_RECOMMENDATION_TEMPLATE = (
+    "일반 개선",
+    "이 문제를 해결하여 전반적인 사용자 경험을 개선하세요.",
+    "중간"
+)
+
+@functools.lru_cache(maxsize=8)
+def _get_credentials(credentials_path: str) -> service_account.Credentials:
+    """
+    서비스 계정 키 파일을 한 번만 읽어 자격 증명 객체를 재사용합니다.
+    """
+    return service_account.Credentials.from_service_account_file(
+        credentials_path,
+        scopes=["https://www.googleapis.com/auth/cloud-platform"],
+    )
+
+@functools.lru_cache(maxsize=8)
+def _get_client(project_id: str, credentials_path: Optional[str] = None) -> bigquery.Client:
+    """
+    프로젝트/자격 증명별 BigQuery 클라이언트를 생성하고 재사용합니다.
+    
+    클라이언트는 인증 토큰과 HTTP 연결 풀을 보유하므로 인스턴스마다 새로 만들지 않습니다.
+    """
+    credentials = _get_credentials(credentials_path) if credentials_path else None
+    return bigquery.Client(project=project_id, credentials=credentials)
 
 class AnalyticsIntegrator:
     def __init__(self, project_id: str, credentials_path: Optional[str] = None):
@@ -14,31 +95,101 @@ class AnalyticsIntegrator:
             project_id (str): GCP 프로젝트 ID
             credentials_path (str, optional): GCP 서비스 계정 키 파일 경로
         """
-        if credentials_path:
-            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = credentials_path
-        
         self.project_id = project_id
-        self.client = bigquery.Client(project=project_id)
+        self.credentials_path = credentials_path
+        self.client = _get_client(project_id, credentials_path)
+        # 대용량 결과 조회 시에만 생성하는 Storage Read API 클라이언트
+        self._bqstorage_client = None
+        
+        # 쿼리 결과 캐시 (키: SQL + 매개변수 해시, 값: (저장 시각, 결과))
+        self._cache: Dict[str, tuple] = {}
+        self._cache_ttl = 300
+        self._cache_max_entries = 128
+        # 실행 중인 동일 쿼리 (중복 요청은 결과를 기다렸다가 캐시를 사용)
+        self._pending: Dict[str, asyncio.Event] = {}
     
-    async def query_analytics_data(self, query: str) -> Dict[str, Any]:
+    def _get_bqstorage_client(self) -> bigquery_storage.BigQueryReadClient:
+        """
+        BigQuery Storage Read API 클라이언트를 필요할 때 생성하여 반환합니다.
+        """
+        if self._bqstorage_client is None:
+            credentials = _get_credentials(self.credentials_path) if self.credentials_path else None
+            self._bqstorage_client = bigquery_storage.BigQueryReadClient(credentials=credentials)
+        return self._bqstorage_client
+    
+    @staticmethod
+    def _cache_key(query: str, params: Optional[List[bigquery.ScalarQueryParameter]]) -> str:
+        """
+        SQL 텍스트와 매개변수로 캐시 키를 생성합니다.
+        """
+        key_source = query + repr([(p.name, p.type_, p.value) for p in params or []])
+        return hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+    
+    async def query_analytics_data(
+        self,
+        query: str,
+        params: Optional[List[bigquery.ScalarQueryParameter]] = None
+    ) -> Dict[str, Any]:
         """
         BigQuery에서 분석 데이터를 쿼리합니다.
         
+        값은 SQL 문자열에 직접 넣지 않고 쿼리 매개변수로 전달하여
+        동일한 SQL 텍스트가 BigQuery 결과 캐시에 적중하도록 합니다.
+        같은 쿼리가 TTL 이내에 다시 요청되면 프로세스 내 캐시에서 반환합니다.
+        
         Args:
             query (str): 실행할 SQL 쿼리
+            params (List[bigquery.ScalarQueryParameter], optional): 쿼리 매개변수
             
         Returns:
             Dict: 쿼리 결과
         """
-        try:
-            query_job = self.client.query(query)
-            results = query_job.result()
+        key = self._cache_key(query, params)
+        
+        while True:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self._cache_ttl:
+                # 최근 사용 항목을 뒤로 옮겨 LRU 순서 유지
+                self._cache[key] = self._cache.pop(key)
+                return copy.deepcopy(cached[1])
             
-            # 결과를 DataFrame으로 변환
-            df = results.to_dataframe()
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            await pending.wait()
+        
+        event = asyncio.Event()
+        self._pending[key] = event
+        try:
+            result = await self._execute_query(query, params)
+            if result.get("success", False):
+                self._cache.pop(key, None)
+                if len(self._cache) >= self._cache_max_entries:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = (time.monotonic(), copy.deepcopy(result))
+            return result
+        finally:
+            del self._pending[key]
+            event.set()
+    
+    async def _execute_query(
+        self,
+        query: str,
+        params: Optional[List[bigquery.ScalarQueryParameter]] = None
+    ) -> Dict[str, Any]:
+        """
+        캐시를 거치지 않고 BigQuery 쿼리를 실행합니다.
+        
+        Args:
+            query (str): 실행할 SQL 쿼리
+            params (List[bigquery.ScalarQueryParameter], optional): 쿼리 매개변수
             
-            # DataFrame을 리스트로 변환
-            records = df.to_dict('records')
+        Returns:
+            Dict: 쿼리 결과
+        """
+        try:
+            # 블로킹 RPC는 스레드에서 실행하여 이벤트 루프를 막지 않음
+            records = await asyncio.to_thread(self._run_query_sync, query, params)
             
             return {
                 "success": True,
@@ -52,6 +203,30 @@ class AnalyticsIntegrator:
                 "message": f"쿼리 실행 오류: {str(e)}"
             }
     
+    def _run_query_sync(
+        self,
+        query: str,
+        params: Optional[List[bigquery.ScalarQueryParameter]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BigQuery 쿼리를 동기적으로 실행하고 결과 행을 딕셔너리 목록으로 반환합니다.
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=params or [],
+            use_query_cache=True
+        )
+        query_job = self.client.query(query, job_config=job_config)
+        results = query_job.result()
+        
+        if results.total_rows and results.total_rows > _STORAGE_API_ROW_THRESHOLD:
+            # 대용량 결과는 Storage Read API로 Arrow 배치를 받아 변환
+            return results.to_arrow(
+                bqstorage_client=self._get_bqstorage_client()
+            ).to_pylist()
+        
+        # DataFrame을 거치지 않고 행을 바로 딕셔너리로 변환
+        return [dict(row.items()) for row in results]
+    
     async def compare_user_journey_with_analytics(
         self, 
         journey_data: Dict[str, Any], 
@@ -70,74 +245,97 @@ class AnalyticsIntegrator:
             Dict: 비교 분석 결과
         """
         # 날짜 범위 계산
-        end_date = datetime.datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.datetime.now() - datetime.timedelta(days=date_range)).strftime('%Y-%m-%d')
-        
-        # GA 데이터 쿼리
-        ga_query = f"""
-        SELECT
-          page_path,
-          COUNT(DISTINCT session_id) AS sessions,
-          COUNT(DISTINCT user_pseudo_id) AS users,
-          AVG(engagement_time_msec) / 1000 AS avg_time_seconds,
-          COUNT(event_name) AS events
-        FROM
-          `{self.project_id}.analytics_data.events_*`
-        WHERE
-          _TABLE_SUFFIX BETWEEN '{start_date.replace('-', '')}' AND '{end_date.replace('-', '')}'
-          AND page_path LIKE '{page_path}%'
-        GROUP BY
-          page_path
-        ORDER BY
-          sessions DESC
-        LIMIT 100
+        now = datetime.datetime.now()
+        end_date = now.strftime('%Y-%m-%d')
+        start_date = (now - datetime.timedelta(days=date_range)).strftime('%Y-%m-%d')
+        start_suffix = start_date.replace('-', '')
+        end_suffix = end_date.replace('-', '')
+        
+        # GA / 체류 시간 / 이탈률 지표를 한 번의 스캔으로 조회
+        # (events_* 샤드를 세 번 읽지 않도록 CTE로 묶고 kind 컬럼으로 구분)
+        # _TABLE_SUFFIX는 CAST/CONCAT 없이 그대로 비교해야 샤드 프루닝이 적용되며,
+        # base에는 필요한 컬럼만 선택하여 스캔 바이트를 줄임
+        # 경로 필터는 STARTS_WITH(@path_prefix)로 전달하여 SQL 인젝션을 막고,
+        # events_* 테이블이 page_path / entrance_page_path로 CLUSTER BY 되어 있으면
+        # BigQuery가 블록 단위로 프루닝할 수 있음 (클러스터링이 없다면 추가 권장)
+        analytics_query = f"""
+        WITH base AS (
+          SELECT
+            page_path,
+            entrance_page_path,
+            session_id,
+            user_pseudo_id,
+            engagement_time_msec,
+            event_name,
+            is_exit
+          FROM
+            `{self.project_id}.analytics_data.events_*`
+          WHERE
+            _TABLE_SUFFIX BETWEEN @start_suffix AND @end_suffix
+            AND (STARTS_WITH(page_path, @path_prefix) OR STARTS_WITH(entrance_page_path, @path_prefix))
+        ),
+        ga AS (
+          SELECT
+            page_path,
+            COUNT(DISTINCT session_id) AS sessions,
+            COUNT(DISTINCT user_pseudo_id) AS users,
+            AVG(engagement_time_msec) / 1000 AS avg_time_seconds,
+            COUNT(event_name) AS events
+          FROM base
+          WHERE STARTS_WITH(page_path, @path_prefix)
+          GROUP BY page_path
+        ),
+        bounce AS (
+          SELECT
+            entrance_page_path AS page_path,
+            COUNTIF(is_exit = TRUE) / COUNT(*) AS bounce_rate
+          FROM base
+          WHERE STARTS_WITH(entrance_page_path, @path_prefix)
+          GROUP BY entrance_page_path
+        )
+        SELECT * FROM (
+          SELECT 'ga' AS kind, ROW_NUMBER() OVER (ORDER BY sessions DESC) AS row_num,
+            page_path, sessions, users, avg_time_seconds, events, CAST(NULL AS FLOAT64) AS bounce_rate
+          FROM ga
+          UNION ALL
+          SELECT 'time', ROW_NUMBER() OVER (ORDER BY avg_time_seconds DESC),
+            page_path, NULL, NULL, avg_time_seconds, NULL, NULL
+          FROM ga
+          UNION ALL
+          SELECT 'bounce', ROW_NUMBER() OVER (ORDER BY bounce_rate DESC),
+            page_path, NULL, NULL, NULL, NULL, bounce_rate
+          FROM bounce
+        )
+        WHERE row_num <= 100
+        ORDER BY kind, row_num
         """
         
-        ga_results = await self.query_analytics_data(ga_query)
+        analytics_params = [
+            bigquery.ScalarQueryParameter("start_suffix", "STRING", start_suffix),
+            bigquery.ScalarQueryParameter("end_suffix", "STRING", end_suffix),
+            bigquery.ScalarQueryParameter("path_prefix", "STRING", page_path),
+        ]
+        
+        analytics_results = await self.query_analytics_data(analytics_query, analytics_params)
         
-        if not ga_results.get("success", False):
+        if not analytics_results.get("success", False):
             return {
                 "success": False,
-                "message": f"GA 데이터 조회 실패: {ga_results.get('message')}"
+                "message": f"GA 데이터 조회 실패: {analytics_results.get('message')}"
             }
         
-        # 페이지별 평균 체류 시간 쿼리
-        time_query = f"""
-        SELECT
-          page_path,
-          AVG(engagement_time_msec) / 1000 AS avg_time_seconds
-        FROM
-          `{self.project_id}.analytics_data.events_*`
-        WHERE
-          _TABLE_SUFFIX BETWEEN '{start_date.replace('-', '')}' AND '{end_date.replace('-', '')}'
-          AND page_path LIKE '{page_path}%'
-        GROUP BY
-          page_path
-        ORDER BY
-          avg_time_seconds DESC
-        LIMIT 100
-        """
-        
-        time_results = await self.query_analytics_data(time_query)
-        
-        # 페이지별 이탈률 쿼리
-        bounce_query = f"""
-        SELECT
-          entrance_page_path AS page_path,
-          COUNTIF(is_exit = TRUE) / COUNT(*) AS bounce_rate
-        FROM
-          `{self.project_id}.analytics_data.events_*`
-        WHERE
-          _TABLE_SUFFIX BETWEEN '{start_date.replace('-', '')}' AND '{end_date.replace('-', '')}'
-          AND entrance_page_path LIKE '{page_path}%'
-        GROUP BY
-          entrance_page_path
-        ORDER BY
-          bounce_rate DESC
-        LIMIT 100
-        """
+        # kind 별로 결과를 나누어 기존 쿼리별 결과와 동일한 형태로 복원
+        split_data = {kind: [] for kind in _ANALYTICS_COLUMNS}
+        for row in analytics_results["data"]:
+            columns = _ANALYTICS_COLUMNS.get(row.get("kind"))
+            if columns:
+                split_data[row["kind"]].append({column: row.get(column) for column in columns})
         
-        bounce_results = await self.query_analytics_data(bounce_query)
+        ga_data = split_data["ga"]
+        time_data = split_data["time"]
+        bounce_data = split_data["bounce"]
+        bounce_rate = (bounce_data[0].get("bounce_rate") or 0) if bounce_data else 0
+        journey_time = journey_data.get("duration", 0)
         
         # 자동화 데이터와 GA 데이터 비교
         comparison = {
@@ -148,13 +346,13 @@ class AnalyticsIntegrator:
                 "days": date_range
             },
             "analytics": {
-                "ga_data": ga_results.get("data", []),
-                "time_data": time_results.get("data", []),
-                "bounce_data": bounce_results.get("data", [])
+                "ga_data": ga_data,
+                "time_data": time_data,
+                "bounce_data": bounce_data
             },
             "automation": {
                 "journey_steps": journey_data.get("steps", []),
-                "journey_duration_seconds": journey_data.get("duration", 0),
+                "journey_duration_seconds": journey_time,
                 "errors_encountered": journey_data.get("errors", []),
                 "ui_metrics": journey_data.get("ui_metrics", {})
             },
@@ -162,59 +360,53 @@ class AnalyticsIntegrator:
         }
         
         # 인사이트 도출
-        if ga_results.get("success", False) and "data" in ga_results:
-            ga_data = ga_results["data"]
-            
-            # 1. 평균 체류 시간 비교
-            if time_results.get("success", False) and "data" in time_results and time_results["data"]:
-                avg_time = time_results["data"][0].get("avg_time_seconds", 0)
-                journey_time = journey_data.get("duration", 0)
-                
-                if journey_time > avg_time * 1.5:
-                    comparison["insights"].append({
-                        "type": "time_insight",
-                        "severity": "high",
-                        "title": "자동화 여정이 평균보다 훨씬 오래 걸림",
-                        "description": f"자동화 여정 시간({journey_time:.2f}초)이 실제 사용자 평균({avg_time:.2f}초)보다 {((journey_time/avg_time)-1)*100:.2f}% 더 깁니다. 사용자 경험 개선이 필요합니다."
-                    })
-                elif journey_time < avg_time * 0.5:
-                    comparison["insights"].append({
-                        "type": "time_insight",
-                        "severity": "medium",
-                        "title": "자동화 여정이 평균보다 훨씬 짧음",
-                        "description": f"자동화 여정 시간({journey_time:.2f}초)이 실제 사용자 평균({avg_time:.2f}초)보다 {(1-(journey_time/avg_time))*100:.2f}% 더 짧습니다. 이는 자동화 스크립트가 실제 사용자 행동을 완전히 모방하지 못함을 나타냅니다."
-                    })
-            
-            # 2. 이탈률 관련 인사이트
-            if bounce_results.get("success", False) and "data" in bounce_results and bounce_results["data"]:
-                bounce_rate = bounce_results["data"][0].get("bounce_rate", 0)
-                
-                if bounce_rate > 0.5:  # 50% 이상 이탈률
-                    comparison["insights"].append({
-                        "type": "bounce_insight",
-                        "severity": "high",
-                        "title": "높은 이탈률 문제",
-                        "description": f"현재 페이지의 이탈률이 {bounce_rate*100:.2f}%로 매우 높습니다. 자동화 테스트 중 발견된 UI 문제가 사용자 이탈의 원인일 수 있습니다."
-                    })
+        # 1. 평균 체류 시간 비교
+        avg_time = (time_data[0].get("avg_time_seconds") or 0) if time_data else 0
+        if avg_time:
+            if journey_time > avg_time * 1.5:
+                comparison["insights"].append({
+                    "type": "time_insight",
+                    "severity": "high",
+                    "title": "자동화 여정이 평균보다 훨씬 오래 걸림",
+                    "description": f"자동화 여정 시간({journey_time:.2f}초)이 실제 사용자 평균({avg_time:.2f}초)보다 {((journey_time/avg_time)-1)*100:.2f}% 더 깁니다. 사용자 경험 개선이 필요합니다."
+                })
+            elif journey_time < avg_time * 0.5:
+                comparison["insights"].append({
+                    "type": "time_insight",
+                    "severity": "medium",
+                    "title": "자동화 여정이 평균보다 훨씬 짧음",
+                    "description": f"자동화 여정 시간({journey_time:.2f}초)이 실제 사용자 평균({avg_time:.2f}초)보다 {(1-(journey_time/avg_time))*100:.2f}% 더 짧습니다. 이는 자동화 스크립트가 실제 사용자 행동을 완전히 모방하지 못함을 나타냅니다."
+                })
+        
+        # 2. 이탈률 관련 인사이트
+        if bounce_rate > 0.5:  # 50% 이상 이탈률
+            comparison["insights"].append({
+                "type": "bounce_insight",
+                "severity": "high",
+                "title": "높은 이탈률 문제",
+                "description": f"현재 페이지의 이탈률이 {bounce_rate*100:.2f}%로 매우 높습니다. 자동화 테스트 중 발견된 UI 문제가 사용자 이탈의 원인일 수 있습니다."
+            })
         
         # 3. UI 메트릭 기반 인사이트
         ui_metrics = journey_data.get("ui_metrics", {})
         if ui_metrics:
             # 페이지 로드 시간 분석
-            if "performance" in ui_metrics and ui_metrics["performance"]:
-                load_time_ms = ui_metrics["performance"].get("loadTimeMs", 0)
+            performance = ui_metrics.get("performance")
+            if performance:
+                load_time_ms = performance.get("loadTimeMs", 0)
                 
                 if load_time_ms > 3000:  # 3초 이상 로드 시간
                     comparison["insights"].append({
                         "type": "performance_insight",
                         "severity": "high",
                         "title": "느린 페이지 로드 시간",
-                        "description": f"페이지 로드 시간이 {load_time_ms/1000:.2f}초로 권장치(3초)보다 깁니다. 이것이 높은 이탈률({bounce_results['data'][0].get('bounce_rate', 0)*100:.2f}%)의 원인일 수 있습니다."
+                        "description": f"페이지 로드 시간이 {load_time_ms/1000:.2f}초로 권장치(3초)보다 깁니다. 이것이 높은 이탈률({bounce_rate*100:.2f}%)의 원인일 수 있습니다."
                     })
             
             # 클릭 가능한 요소 문제 분석
-            if "clickableMetrics" in ui_metrics:
-                small_targets_ratio = ui_metrics["clickableMetrics"].get("smallTargets", 0) / max(ui_metrics["clickableMetrics"].get("total", 1), 1)
+            clickable = ui_metrics.get("clickableMetrics")
+            if clickable:
+                small_targets_ratio = clickable.get("smallTargets", 0) / max(clickable.get("total", 1), 1)
                 
                 if small_targets_ratio > 0.3:  # 30% 이상의 요소가 작은 경우
                     comparison["insights"].append({
@@ -230,6 +422,16 @@ class AnalyticsIntegrator:
             "comparison": comparison
         }
     
+    @staticmethod
+    def _count_issue(summary: Dict[str, int], severity: str) -> None:
+        """
+        보고서 요약의 전체 이슈 수와 심각도별 이슈 수를 증가시킵니다.
+        """
+        summary["issues_found"] += 1
+        key = _SEVERITY_SUMMARY_KEY.get(severity)
+        if key:
+            summary[key] += 1
+    
     async def generate_ux_improvement_report(
         self, 
         journey_data: Dict[str, Any],
@@ -271,7 +473,7 @@ class AnalyticsIntegrator:
         insights = analytics_comparison.get("comparison", {}).get("insights", [])
         for insight in insights:
             severity = insight.get("severity", "medium")
-            severity_value = {"critical": 4, "high": 3, "medium": 2, "low": 1}.get(severity, 2)
+            severity_value = _SEVERITY_VALUE.get(severity, 2)
             
             report["issues"].append({
                 "title": insight.get("title", "이슈"),
@@ -284,22 +486,14 @@ class AnalyticsIntegrator:
             })
             
             # 이슈 카운트 업데이트
-            report["summary"]["issues_found"] += 1
-            if severity == "critical":
-                report["summary"]["critical_issues"] += 1
-            elif severity == "high":
-                report["summary"]["high_priority_issues"] += 1
-            elif severity == "medium":
-                report["summary"]["medium_priority_issues"] += 1
-            elif severity == "low":
-                report["summary"]["low_priority_issues"] += 1
+            self._count_issue(report["summary"], severity)
         
         # 2. 접근성 이슈 추출
         a11y_violations = a11y_results.get("results", {}).get("mainViolations", [])
         for violation in a11y_violations:
             impact = violation.get("impact", "minor")
-            severity = {"critical": "critical", "serious": "high", "moderate": "medium", "minor": "low"}.get(impact, "medium")
-            severity_value = {"critical": 4, "high": 3, "medium": 2, "low": 1}.get(severity, 2)
+            severity = _IMPACT_TO_SEVERITY.get(impact, "medium")
+            severity_value = _SEVERITY_VALUE.get(severity, 2)
             
             report["issues"].append({
                 "title": f"접근성 문제: {violation.get('id', '알 수 없음')}",
@@ -313,15 +507,7 @@ class AnalyticsIntegrator:
             })
             
             # 이슈 카운트 업데이트
-            report["summary"]["issues_found"] += 1
-            if severity == "critical":
-                report["summary"]["critical_issues"] += 1
-            elif severity == "high":
-                report["summary"]["high_priority_issues"] += 1
-            elif severity == "medium":
-                report["summary"]["medium_priority_issues"] += 1
-            elif severity == "low":
-                report["summary"]["low_priority_issues"] += 1
+            self._count_issue(report["summary"], severity)
         
         # 3. 사용자 여정 오류 추출
         journey_errors = journey_data.get("errors", [])
@@ -337,32 +523,35 @@ class AnalyticsIntegrator:
             })
             
             # 이슈 카운트 업데이트
-            report["summary"]["issues_found"] += 1
-            report["summary"]["high_priority_issues"] += 1
+            self._count_issue(report["summary"], "high")
         
         # 4. UI 메트릭 기반 이슈 추출
-        ui_metrics = journey_data.get("ui_metrics", {})
+        ui_metrics = journey_data.get("ui_metrics") or {}
+        performance = ui_metrics.get("performance") or {}
+        clickable = ui_metrics.get("clickableMetrics") or {}
+        images = ui_metrics.get("imageMetrics") or {}
         
         # 4.1. 로딩 성능 이슈
-        if ui_metrics.get("performance", {}).get("loadTimeMs", 0) > 3000:
+        load_time_ms = performance.get("loadTimeMs", 0)
+        if load_time_ms > 3000:
             report["issues"].append({
                 "title": "느린 페이지 로드 시간",
-                "description": f"페이지 로드 시간이 {ui_metrics['performance']['loadTimeMs']/1000:.2f}초로 권장치(3초)보다 깁니다.",
+                "description": f"페이지 로드 시간이 {load_time_ms/1000:.2f}초로 권장치(3초)보다 깁니다.",
                 "severity": "high",
                 "severity_value": 3,
                 "type": "performance",
                 "source": "ui_metrics",
-                "evidence": f"로드 시간: {ui_metrics['performance']['loadTimeMs']/1000:.2f}초"
+                "evidence": f"로드 시간: {load_time_ms/1000:.2f}초"
             })
             
             # 이슈 카운트 업데이트
-            report["summary"]["issues_found"] += 1
-            report["summary"]["high_priority_issues"] += 1
+            self._count_issue(report["summary"], "high")
         
-        # 4.2. 작은 클릭 영역 이슈
-        if "clickableMetrics" in ui_metrics:
-            small_targets = ui_metrics["clickableMetrics"].get("smallTargets", 0)
-            total_targets = ui_metrics["clickableMetrics"].get("total", 1)
+        if clickable:
+            total_targets = clickable.get("total", 1)
+            
+            # 4.2. 작은 클릭 영역 이슈
+            small_targets = clickable.get("smallTargets", 0)
             small_targets_ratio = small_targets / max(total_targets, 1)
             
             if small_targets_ratio > 0.3:  # 30% 이상의 요소가 작은 경우
@@ -377,13 +566,10 @@ class AnalyticsIntegrator:
                 })
                 
                 # 이슈 카운트 업데이트
-                report["summary"]["issues_found"] += 1
-                report["summary"]["medium_priority_issues"] += 1
-        
-        # 4.3. 라벨 없는 클릭 요소 이슈
-        if "clickableMetrics" in ui_metrics:
-            no_labels = ui_metrics["clickableMetrics"].get("withoutLabels", 0)
-            total_targets = ui_metrics["clickableMetrics"].get("total", 1)
+                self._count_issue(report["summary"], "medium")
+            
+            # 4.3. 라벨 없는 클릭 요소 이슈
+            no_labels = clickable.get("withoutLabels", 0)
             no_labels_ratio = no_labels / max(total_targets, 1)
             
             if no_labels_ratio > 0.1:  # 10% 이상의 요소에 라벨이 없는 경우
@@ -398,13 +584,12 @@ class AnalyticsIntegrator:
                 })
                 
                 # 이슈 카운트 업데이트
-                report["summary"]["issues_found"] += 1
-                report["summary"]["medium_priority_issues"] += 1
+                self._count_issue(report["summary"], "medium")
         
         # 4.4 이미지 대체 텍스트 이슈
-        if "imageMetrics" in ui_metrics:
-            without_alt = ui_metrics["imageMetrics"].get("withoutAlt", 0)
-            total_images = ui_metrics["imageMetrics"].get("total", 1)
+        if images:
+            without_alt = images.get("withoutAlt", 0)
+            total_images = images.get("total", 1)
             without_alt_ratio = without_alt / max(total_images, 1)
             
             if without_alt_ratio > 0.2:  # 20% 이상의 이미지에 대체 텍스트가 없는 경우
@@ -419,57 +604,24 @@ class AnalyticsIntegrator:
                 })
                 
                 # 이슈 카운트 업데이트
-                report["summary"]["issues_found"] += 1
-                report["summary"]["medium_priority_issues"] += 1
+                self._count_issue(report["summary"], "medium")
         
         # 5. 권장 사항 생성
-        # 이슈를 심각도에 따라 정렬
-        sorted_issues = sorted(report["issues"], key=lambda x: x["severity_value"], reverse=True)
+        # 심각도 상위 5개 이슈에 대한 권장 사항 생성 (전체 정렬 없이 선택)
+        top_issues = heapq.nlargest(5, report["issues"], key=itemgetter("severity_value"))
         
-        # 상위 5개 이슈에 대한 권장 사항 생성
-        for i, issue in enumerate(sorted_issues[:5]):
-            issue_type = issue.get("type", "general")
+        for i, issue in enumerate(top_issues):
+            title_prefix, description, potential_impact = _RECOMMENDATION_TEMPLATES.get(
+                issue.get("type", "general"), _DEFAULT_RECOMMENDATION_TEMPLATE
+            )
             
-            if issue_type == "performance":
-                report["recommendations"].append({
-                    "priority": i + 1,
-                    "title": f"성능 최적화: {issue['title']}",
-                    "description": "페이지 로드 시간을 개선하기 위해 이미지 최적화, 자바스크립트 최소화, 중요하지 않은 리소스 지연 로딩 등의 기법을 적용하세요.",
-                    "related_issue": issue["title"],
-                    "potential_impact": "높음"
-                })
-            elif issue_type == "accessibility":
-                report["recommendations"].append({
-                    "priority": i + 1,
-                    "title": f"접근성 개선: {issue['title']}",
-                    "description": f"WCAG 지침에 따라 해당 접근성 문제를 수정하세요. 관련 도움말: {issue.get('helpUrl', '해당 없음')}",
-                    "related_issue": issue["title"],
-                    "potential_impact": "높음"
-                })
-            elif issue_type == "usability":
-                report["recommendations"].append({
-                    "priority": i + 1,
-                    "title": f"사용성 개선: {issue['title']}",
-                    "description": "모든 대화형 요소가 충분한 크기와 적절한 간격을 가지도록 개선하세요. 특히 모바일 사용자를 위한 최소 44x44 픽셀 크기를 권장합니다.",
-                    "related_issue": issue["title"],
-                    "potential_impact": "중간"
-                })
-            elif issue_type == "journey_error":
-                report["recommendations"].append({
-                    "priority": i + 1,
-                    "title": f"사용자 여정 개선: {issue['title']}",
-                    "description": "사용자가 목표를 달성하는 과정에서 발생한 오류를 수정하세요. 명확한 오류 메시지와 복구 경로를 제공하는 것이 중요합니다.",
-                    "related_issue": issue["title"],
-                    "potential_impact": "높음"
-                })
-            else:
-                report["recommendations"].append({
-                    "priority": i + 1,
-                    "title": f"일반 개선: {issue['title']}",
-                    "description": "이 문제를 해결하여 전반적인 사용자 경험을 개선하세요.",
-                    "related_issue": issue["title"],
-                    "potential_impact": "중간"
-                })
+            report["recommendations"].append({
+                "priority": i + 1,
+                "title": f"{title_prefix}: {issue['title']}",
+                "description": description.format(help_url=issue.get("helpUrl", "해당 없음")),
+                "related_issue": issue["title"],
+                "potential_impact": potential_impact
+            })
         
         return {
             "success": True,
@@ -1,96 +1,324 @@
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
 from google.oauth2 import service_account
 from google.cloud.exceptions import Forbidden, NotFound
 import os
 import json
 import re
-import sys
+import asyncio
 import time  # 파일 상단으로 이동
-import pathlib
-from typing import Optional, Dict, Any, List, Tuple
+import itertools
+import heapq
+from operator import itemgetter
+from collections import OrderedDict
+import threading
+import requests
+import orjson
+import numpy as np
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 from dotenv import load_dotenv
 from agentpress.tool import Tool, ToolResult, openapi_schema, xml_schema
 from utils.config import config
-import logging
-from fuzzywuzzy import process, fuzz  # 문자열 유사도 측정 라이브러리
+from utils.logger import logger
+from rapidfuzz import process, fuzz, utils  # 문자열 유사도 측정 라이브러리 (C++ 구현)
 
-logger = logging.getLogger(__name__)
+# 데이터셋/테이블/스키마 메타데이터 캐시 유효 시간 (초) 및 최대 항목 수 (LRU)
+_META_CACHE_TTL = 300
+_META_CACHE_MAX_ENTRIES = 256
+
+# search_resources의 resource_type 값과 각 리소스 검색 여부
+_RESOURCE_TYPES = frozenset({"dataset", "table", "field", "all"})
+_SEARCH_DATASETS = frozenset({"dataset", "all"})
+_SEARCH_TABLES = frozenset({"table", "all"})
+_SEARCH_FIELDS = frozenset({"field", "all"})
+
+# 리소스 검색에 사용하는 유사도 함수 (모든 호출 지점이 같은 C++ 스코어러를 공유)
+_SEARCH_SCORER = fuzz.token_set_ratio
+
+# search_resources/generate_query의 기본 최소 유사도 점수
+_DEFAULT_MIN_SIMILARITY = 60
+
+# (credentials_path, project_id, location) 별로 공유하는 BigQuery 클라이언트
+# 인증 세션과 HTTP 연결 풀을 도구 인스턴스 간에 재사용하기 위함
+_CLIENT_CACHE: Dict[Tuple, bigquery.Client] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# 시작 시 권한 검사(SELECT 1 포함)는 (project_id, credentials_path) 별로 프로세스당 한 번만 수행
+# 이후 인스턴스는 캐시된 결과 로그를 그대로 사용함
+# 명시적인 헬스 체크가 필요하면 도구 생성에 의존하지 말고 별도 엔드포인트에서 수행할 것
+_PROBE_DONE: set = set()
+_PROBE_LOGS: Dict[Tuple[str, str], List[str]] = {}
+
+# 검증을 마친 서비스 계정 키 내용 ((경로, 수정 시각 ns) 별) 및 형식 검증을 통과한 프로젝트 ID
+# 같은 파일/프로젝트로 도구를 다시 생성할 때 디스크 I/O와 재검증을 생략하기 위함
+_CRED_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+_VALIDATED_PROJECTS: set = set()
+
+# 공유 클라이언트의 HTTP 연결 풀 크기
+_HTTP_POOL_CONNECTIONS = 20
+_HTTP_POOL_MAXSIZE = 50
+
+# 이 행 수를 넘는 결과는 REST 페이지 조회 대신 BigQuery Storage Read API(Arrow)로 읽음
+_STORAGE_API_ROW_THRESHOLD = 5000
+
+# 쿼리 검증/변환에 사용하는 정규식 (호출마다 다시 만들지 않도록 모듈 로드 시 컴파일)
+# 읽기 전용 검증: 쿼리를 단어 단위로 한 번 스캔한 뒤 금지 키워드 집합과 비교 (대안 패턴 역추적 없이 선형 시간)
+_FORBIDDEN_KEYWORDS = frozenset({
+    'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER', 'MERGE',
+    'TRUNCATE', 'GRANT', 'REVOKE', 'EXECUTE', 'BEGIN', 'COMMIT', 'ROLLBACK'
+})
+_WORD_RE = re.compile(r'\w+')
+_PROJECT_ID_RE = re.compile(r'[a-z0-9-]+')
+_HAS_INFO_SCHEMA_RE = re.compile(r'INFORMATION_SCHEMA', re.IGNORECASE)
+# FROM INFORMATION_SCHEMA.TABLES 또는 FROM dataset.INFORMATION_SCHEMA.TABLES 매치
+_INFO_SCHEMA_TABLES_RE = re.compile(r'FROM\s+(?:(\w+)\.)?INFORMATION_SCHEMA\.TABLES', re.IGNORECASE)
+
+# generate_query에서 자연어 설명을 해석할 때 사용하는 정규식
+_PERIOD_RE = re.compile(r'\b(\d+)\s*(?:days|day|months|month|years|year|일|개월|년|주|weeks|week)\b')
+_LIMIT_RE = re.compile(r'\b(?:top|상위|하위)\s*(\d+)\b')
+_GA_SESSIONS_TABLE_RE = re.compile(r'^ga_.*sessions.*$', re.IGNORECASE)
+
+# generate_query에서 날짜/숫자 필드로 취급하는 BigQuery 타입
+_DATE_FIELD_TYPES = frozenset({"DATE", "DATETIME", "TIMESTAMP"})
+_NUMERIC_FIELD_TYPES = frozenset({"INTEGER", "FLOAT", "NUMERIC"})
+
+# generate_query 키워드 분류 (라벨 -> 설명에 부분 문자열로 포함되면 해당 라벨로 판단하는 키워드)
+_QUERY_KEYWORDS = {
+    # 집계
+    "count": ("count", "세기", "개수", "숫자", "횟수"),
+    "sum": ("sum", "total", "합계", "합산"),
+    "avg": ("average", "avg", "평균"),
+    # 날짜 그룹
+    "date_group": ("일별", "날짜별", "날짜", "일자", "day", "daily", "per day", "by date"),
+    "month_group": ("월별", "월간", "month", "monthly", "per month", "by month"),
+    "year_group": ("연도별", "연간", "year", "yearly", "annual", "by year"),
+    # 기간 제한
+    "recent": ("recent", "last", "최근"),
+    "day_period": ("days", "일간"),
+    "month_period": ("months", "개월"),
+    "year_period": ("years", "연간"),
+    # 정렬
+    "sort_desc": ("top", "highest", "most", "상위", "많은"),
+    "sort_asc": ("bottom", "lowest", "least", "하위", "적은"),
+}
+
+def _build_keyword_matcher(groups: Dict[str, Tuple[str, ...]]) -> Tuple["re.Pattern", Dict[str, frozenset]]:
+    """
+    모든 키워드를 한 번에 찾는 정규식과 키워드별 라벨 집합 생성
+    
+    각 위치에서 가장 긴 키워드만 매치되므로, 키워드의 라벨 집합에 그 키워드에 포함된
+    다른 키워드의 라벨까지 미리 합쳐 둡니다 (예: "days" -> day_period + date_group).
+    """
+    labels_by_keyword: Dict[str, set] = {}
+    for label, keywords in groups.items():
+        for keyword in keywords:
+            labels_by_keyword.setdefault(keyword, set()).add(label)
+    
+    expanded = {
+        keyword: frozenset().union(*(labels for other, labels in labels_by_keyword.items() if other in keyword))
+        for keyword in labels_by_keyword
+    }
+    alternatives = "|".join(re.escape(keyword) for keyword in sorted(expanded, key=len, reverse=True))
+    # 전방 탐색으로 모든 시작 위치에서 겹치는 매치까지 찾음
+    return re.compile(f"(?=({alternatives}))"), expanded
+
+_QUERY_KEYWORD_RE, _QUERY_KEYWORD_LABELS = _build_keyword_matcher(_QUERY_KEYWORDS)
+
+def _keyword_labels(text: str) -> set:
+    """소문자 설명 문자열에 포함된 키워드들의 라벨 집합"""
+    labels = set()
+    for match in _QUERY_KEYWORD_RE.finditer(text):
+        labels |= _QUERY_KEYWORD_LABELS[match.group(1)]
+    return labels
+
+def _isoformat(value: Any) -> Any:
+    """날짜/시간 값을 ISO 8601 문자열로 변환"""
+    return value.isoformat() if value is not None else None
+
+def _as_bool(value: Any) -> bool:
+    """
+    도구 인자를 bool로 변환 (XML 속성은 "false" 같은 문자열로 전달되므로 truthy 여부로 판단하지 않음)
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
+def _dump_nested(value: Any) -> Any:
+    """
+    중첩 구조(STRUCT, REPEATED, JSON 객체)를 JSON 문자열로 변환
+    
+    orjson은 중첩된 datetime 값을 ISO 8601로 직접 직렬화하며, 그 외 타입(Decimal 등)은 문자열로 변환
+    """
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value, default=str, option=orjson.OPT_NAIVE_UTC).decode()
+    return value
+
+def _identity(value: Any) -> Any:
+    return value
+
+# BigQuery 필드 타입별 결과 값 변환 함수
+_VALUE_CONVERTERS = {
+    "TIMESTAMP": _isoformat,
+    "DATETIME": _isoformat,
+    "DATE": _isoformat,
+    "TIME": _isoformat,
+    "RECORD": _dump_nested,
+    "STRUCT": _dump_nested,
+    "JSON": _dump_nested,
+}
+
+def _value_converter(field: bigquery.SchemaField) -> Callable[[Any], Any]:
+    """스키마 필드에 맞는 결과 값 변환 함수 반환"""
+    if field.mode == "REPEATED":
+        return _dump_nested
+    return _VALUE_CONVERTERS.get(field.field_type, _identity)
 
 class BigQueryTool(Tool):
     """Tool for executing BigQuery SQL queries against Google Cloud Platform."""
 
-    def __init__(self, credentials_path: str = None, project_id: str = None, location: str = None):
+    def __init__(
+        self,
+        credentials_path: str = None,
+        project_id: str = None,
+        location: str = None,
+        check_permissions: bool = True
+    ):
+        """
+        설정만 저장하는 가벼운 생성자입니다.
+        
+        키 파일 검증, 클라이언트 생성, 권한 검사처럼 I/O가 필요한 작업은 첫 호출 시
+        _ensure_client()에서 스레드로 수행됩니다. 미리 초기화하려면 create()를 사용하세요.
+        """
         super().__init__()
         # Load environment variables
         load_dotenv()
         
+        # 메타데이터 캐시 (키: ("datasets", include_details) / ("tables", dataset_id, include_details) /
+        # ("all_datasets",) / ("all_tables",) / ("schema", dataset_id, table_id) / ("schema_fields", dataset_id, table_id))
+        self._meta_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        
         # 환경변수에서 설정을 가져오거나 매개변수로 전달된 값 사용
         self.credentials_path = credentials_path or config.get('BIGQUERY_CREDENTIALS_PATH')
         self.project_id = project_id or config.get('BIGQUERY_PROJECT_ID')
         self.location = location or config.get('BIGQUERY_LOCATION')
+        self.check_permissions = check_permissions
         
         if not self.credentials_path:
             raise ValueError("BIGQUERY_CREDENTIALS_PATH not found in configuration or provided as parameter")
         if not self.project_id:
             raise ValueError("BIGQUERY_PROJECT_ID not found in configuration or provided as parameter")
-            
-        # 서비스 계정 키 파일 검증
-        self._validate_credentials_file()
         
         # 프로젝트 ID 형식 검증
         self._validate_project_id()
         
+        # 서비스 계정 키 파일 검증 시 채워짐
+        self._cred_data: Optional[Dict[str, Any]] = None
+        self._sa_email: Optional[str] = None
+        self._sa_project: Optional[str] = None
+        
+        # BigQuery 클라이언트는 첫 사용 시 생성
+        self.client: Optional[bigquery.Client] = None
+        # 초기화 락은 이벤트 루프 안에서 처음 필요할 때 생성 (_ensure_client)
+        self._client_lock: Optional[asyncio.Lock] = None
+        # 대용량 결과 조회 시에만 생성하는 Storage Read API 클라이언트 (BigQuery 클라이언트와 같은 인증 정보 사용)
+        self._bqstorage_client: Optional[bigquery_storage.BigQueryReadClient] = None
+        self._bqstorage_client_lock = threading.Lock()
+    
+    @classmethod
+    async def create(
+        cls,
+        credentials_path: str = None,
+        project_id: str = None,
+        location: str = None,
+        check_permissions: bool = True
+    ) -> "BigQueryTool":
+        """클라이언트 초기화까지 마친 BigQueryTool을 이벤트 루프를 막지 않고 생성"""
+        tool = cls(credentials_path, project_id, location, check_permissions)
+        await tool._ensure_client()
+        return tool
+    
+    async def _ensure_client(self) -> bigquery.Client:
+        """BigQuery 클라이언트가 없으면 스레드에서 초기화한 뒤 반환"""
+        if self.client is None:
+            if self._client_lock is None:
+                self._client_lock = asyncio.Lock()
+            async with self._client_lock:
+                if self.client is None:
+                    await asyncio.to_thread(self._initialize_client)
+        return self.client
+    
+    def _initialize_client(self) -> None:
+        """공유 BigQuery 클라이언트를 가져오거나 새로 생성 (블로킹)"""
+        cache_key = (self.credentials_path, self.project_id, self.location)
+        with _CLIENT_CACHE_LOCK:
+            client = _CLIENT_CACHE.get(cache_key)
+        if client is None:
+            # 키 검증/권한 검사(네트워크 호출)는 락 밖에서 수행하고, 결과만 락 안에서 등록
+            # 동시에 생성된 경우 먼저 등록된 클라이언트를 사용
+            client = self._create_client()
+            with _CLIENT_CACHE_LOCK:
+                client = _CLIENT_CACHE.setdefault(cache_key, client)
+        self.client = client
+    
+    def _create_client(self) -> bigquery.Client:
+        """서비스 계정 키 검증, BigQuery 클라이언트 생성 및 권한 검사 (블로킹)"""
+        # 서비스 계정 키 파일 검증
+        self._validate_credentials_file()
+        
         # BigQuery 클라이언트 초기화
         try:
-            credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_path,
+            credentials = service_account.Credentials.from_service_account_info(
+                self._cred_data,
                 scopes=["https://www.googleapis.com/auth/cloud-platform"],
             )
-            self.client = bigquery.Client(
+            client = bigquery.Client(
                 credentials=credentials, 
                 project=self.project_id,
                 location=self.location
             )
+            # 동시 도구 호출이 연결을 기다리지 않도록 연결 풀 확장
+            client._http.mount("https://", requests.adapters.HTTPAdapter(
+                pool_connections=_HTTP_POOL_CONNECTIONS,
+                pool_maxsize=_HTTP_POOL_MAXSIZE
+            ))
             logger.info(f"BigQuery client initialized for project: {self.project_id}, location: {self.location or 'default'}")
             
             # 권한 검사 수행 - 이는 Docker 로그에 표시됨
-            auth_status = self._check_permissions()
-            for log_line in auth_status:
-                # 두 가지 로그 방식 모두 사용 (logger와 stdout)
-                logger.info(log_line)
-                print(log_line, file=sys.stderr)  # Docker 로그에 출력
+            if self.check_permissions:
+                for log_line in self._check_permissions(client):
+                    logger.info(log_line)
+            
+            return client
                 
         except Exception as e:
             error_message = f"Failed to initialize BigQuery client: {str(e)}"
-            logger.error(error_message)
-            print(f"[BIGQUERY_AUTH_ERROR] {error_message}", file=sys.stderr)  # Docker 로그에 출력
+            logger.error(f"[BIGQUERY_AUTH_ERROR] {error_message}")
             raise ValueError(error_message)
     
-    def _check_permissions(self) -> List[str]:
+    def _check_permissions(self, client: bigquery.Client) -> List[str]:
         """
         BigQuery 권한을 검사하고 권한 상태에 대한 로그 메시지 목록을 반환합니다.
+        
+        같은 프로젝트/키 파일에 대한 검사는 프로세스당 한 번만 수행하며,
+        BIGQUERY_SKIP_STARTUP_PROBE=1 이면 쿼리 실행(SELECT 1) 검사를 생략합니다.
         """
+        probe_key = (self.project_id, self.credentials_path)
+        if probe_key in _PROBE_DONE:
+            return _PROBE_LOGS.get(probe_key, [])
+        
         log_messages = []
         log_messages.append(f"[BIGQUERY_AUTH_CHECK] Checking permissions for project: {self.project_id}")
         
-        # 서비스 계정 정보 확인
-        try:
-            service_account_email = None
-            with open(self.credentials_path, 'r') as f:
-                creds_data = json.load(f)
-                service_account_email = creds_data.get('client_email')
-            
-            if service_account_email:
-                log_messages.append(f"[BIGQUERY_AUTH_INFO] Using service account: {service_account_email}")
-            else:
-                log_messages.append("[BIGQUERY_AUTH_WARNING] Service account email not found in credentials file")
-        except Exception as e:
-            log_messages.append(f"[BIGQUERY_AUTH_WARNING] Error reading service account details: {str(e)}")
+        # 서비스 계정 정보 확인 (키 파일 검증 시 읽어 둔 값 사용)
+        if self._sa_email:
+            log_messages.append(f"[BIGQUERY_AUTH_INFO] Using service account: {self._sa_email}")
+        else:
+            log_messages.append("[BIGQUERY_AUTH_WARNING] Service account email not found in credentials file")
         
         # 1. 데이터셋 리스팅 권한 확인
         try:
             # 리스트만 확인하고 실제 데이터는 가져오지 않음
-            datasets = list(self.client.list_datasets(max_results=1))
+            datasets = list(client.list_datasets(max_results=1))
             log_messages.append(f"[BIGQUERY_AUTH_SUCCESS] Successfully listed datasets in project {self.project_id}")
         except Forbidden as e:
             log_messages.append(f"[BIGQUERY_AUTH_ERROR] Permission denied: Cannot list datasets. Error: {str(e)}")
@@ -99,11 +327,18 @@ class BigQueryTool(Tool):
             log_messages.append(f"[BIGQUERY_AUTH_ERROR] Error listing datasets: {str(e)}")
         
         # 2. 쿼리 실행 권한 확인 - 간단한 SELECT 1 실행
+        if os.getenv("BIGQUERY_SKIP_STARTUP_PROBE") == "1":
+            log_messages.append("[BIGQUERY_AUTH_INFO] Skipped test query (BIGQUERY_SKIP_STARTUP_PROBE=1)")
+            return log_messages
+        
         try:
-            query_job = self.client.query("SELECT 1 AS test")
+            query_job = client.query("SELECT 1 AS test")
             # 결과 가져오기
             query_job.result()
             log_messages.append("[BIGQUERY_AUTH_SUCCESS] Successfully executed test query")
+            # 검사 성공 시에만 결과를 공유 (실패한 경우 다음 인스턴스에서 다시 검사)
+            _PROBE_DONE.add(probe_key)
+            _PROBE_LOGS[probe_key] = list(log_messages)
         except Forbidden as e:
             log_messages.append(f"[BIGQUERY_AUTH_ERROR] Permission denied: Cannot execute queries. Error: {str(e)}")
             log_messages.append("[BIGQUERY_AUTH_TIP] Service account needs 'BigQuery Job User' role for running queries")
@@ -114,30 +349,40 @@ class BigQueryTool(Tool):
     
     def _log_auth_info(self, message: str):
         """
-        권한 관련 정보를 로그에 기록하고 Docker 로그에도 출력합니다.
+        권한 관련 정보를 로그에 기록합니다. (앱 공통 로거 설정을 따름)
         """
         logger.info(message)
-        print(message, file=sys.stderr)  # stderr로 출력하면 Docker 로그에 표시됨
 
     def _validate_credentials_file(self) -> None:
-        """서비스 계정 키 파일 유효성 검증"""
+        """서비스 계정 키 파일 유효성 검증 (파일이 바뀌지 않았으면 이전 검증 결과 재사용)"""
         try:
-            # 파일 존재 및 접근 가능 여부 확인
-            cred_path = pathlib.Path(self.credentials_path)
-            if not cred_path.exists():
+            # 파일 존재 여부 확인 (수정 시각을 캐시 키로 사용)
+            try:
+                st = os.stat(self.credentials_path)
+            except FileNotFoundError:
                 raise ValueError(f"서비스 계정 키 파일을 찾을 수 없습니다: {self.credentials_path}")
-            if not os.access(self.credentials_path, os.R_OK):
-                raise ValueError(f"서비스 계정 키 파일에 접근할 수 없습니다: {self.credentials_path}. 파일 권한을 확인하세요.")
+            cache_key = (self.credentials_path, st.st_mtime_ns)
             
-            # 파일 내용 검증
-            with open(self.credentials_path, 'r') as f:
-                key_data = json.load(f)
+            key_data = _CRED_CACHE.get(cache_key)
+            if key_data is None:
+                if not os.access(self.credentials_path, os.R_OK):
+                    raise ValueError(f"서비스 계정 키 파일에 접근할 수 없습니다: {self.credentials_path}. 파일 권한을 확인하세요.")
                 
-            # 기본 키 파일 구조 검증
-            if not key_data.get('type') or key_data.get('type') != 'service_account' or not key_data.get('project_id'):
-                raise ValueError('유효하지 않은 서비스 계정 키 파일 형식입니다.')
+                # 파일 내용 검증
+                with open(self.credentials_path, 'r') as f:
+                    key_data = json.load(f)
+                    
+                # 기본 키 파일 구조 검증
+                if not key_data.get('type') or key_data.get('type') != 'service_account' or not key_data.get('project_id'):
+                    raise ValueError('유효하지 않은 서비스 계정 키 파일 형식입니다.')
                 
-            logger.info(f"서비스 계정 키 파일 검증 완료: {self.credentials_path}")
+                _CRED_CACHE[cache_key] = key_data
+                logger.info(f"서비스 계정 키 파일 검증 완료: {self.credentials_path}")
+            
+            # 클라이언트 생성과 권한 검사 로그에서 사용 (파일을 다시 읽지 않도록)
+            self._cred_data = key_data
+            self._sa_email = key_data.get('client_email')
+            self._sa_project = key_data.get('project_id')
         except json.JSONDecodeError:
             raise ValueError('서비스 계정 키 파일이 유효한 JSON 형식이 아닙니다.')
         except Exception as e:
@@ -146,62 +391,270 @@ class BigQueryTool(Tool):
     
     def _validate_project_id(self) -> None:
         """프로젝트 ID 형식 검증"""
-        if not self.project_id or not re.match(r'^[a-z0-9-]+$', self.project_id):
+        if self.project_id in _VALIDATED_PROJECTS:
+            return
+        if not self.project_id or not _PROJECT_ID_RE.fullmatch(self.project_id):
             raise ValueError(f"유효하지 않은 프로젝트 ID 형식입니다: {self.project_id}")
+        _VALIDATED_PROJECTS.add(self.project_id)
         logger.info(f"프로젝트 ID 검증 완료: {self.project_id}")
     
     def _is_read_only_query(self, query: str) -> bool:
         """쿼리가 읽기 전용인지 확인"""
-        forbidden_pattern = r'\b(INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|MERGE|TRUNCATE|GRANT|REVOKE|EXECUTE|BEGIN|COMMIT|ROLLBACK)\b'
-        return not bool(re.search(forbidden_pattern, query, re.IGNORECASE))
+        return _FORBIDDEN_KEYWORDS.isdisjoint(_WORD_RE.findall(query.upper()))
     
     def _qualify_information_schema_query(self, query: str) -> str:
         """INFORMATION_SCHEMA 쿼리에 프로젝트 ID 추가"""
-        if 'INFORMATION_SCHEMA' in query.upper():
-            # FROM INFORMATION_SCHEMA.TABLES 또는 FROM dataset.INFORMATION_SCHEMA.TABLES 매치
-            unqualified_pattern = r'FROM\s+(?:(\w+)\.)?INFORMATION_SCHEMA\.TABLES'
-            
-            def replace_match(match):
-                dataset = match.group(1)
-                if dataset:
-                    return f"FROM `{self.project_id}.{dataset}.INFORMATION_SCHEMA.TABLES`"
-                else:
-                    raise ValueError("INFORMATION_SCHEMA 쿼리 시 데이터셋을 지정해야 합니다 (예: dataset.INFORMATION_SCHEMA.TABLES)")
-            
-            query = re.sub(unqualified_pattern, replace_match, query, flags=re.IGNORECASE)
+        # 대부분의 쿼리는 INFORMATION_SCHEMA를 쓰지 않으므로 대문자 변환 없이 바로 반환
+        if not _HAS_INFO_SCHEMA_RE.search(query):
+            return query
+        
+        def replace_match(match):
+            dataset = match.group(1)
+            if dataset:
+                return f"FROM `{self.project_id}.{dataset}.INFORMATION_SCHEMA.TABLES`"
+            else:
+                raise ValueError("INFORMATION_SCHEMA 쿼리 시 데이터셋을 지정해야 합니다 (예: dataset.INFORMATION_SCHEMA.TABLES)")
+        
+        return _INFO_SCHEMA_TABLES_RE.sub(replace_match, query)
+    
+    async def _cached(self, key: Tuple, loader: Callable[[], Awaitable[Any]], ttl: float = _META_CACHE_TTL) -> Any:
+        """
+        TTL 이내의 캐시된 값을 반환하고, 없으면 loader 결과를 캐시에 저장 후 반환
         
-        return query
+        캐시는 최근 사용 순서를 유지하며 _META_CACHE_MAX_ENTRIES를 넘으면 가장 오래 쓰지 않은 항목부터 제거합니다.
+        """
+        entry = self._meta_cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            self._meta_cache.move_to_end(key)
+            return entry[1]
+        
+        value = await loader()
+        self._meta_cache[key] = (time.monotonic(), value)
+        self._meta_cache.move_to_end(key)
+        while len(self._meta_cache) > _META_CACHE_MAX_ENTRIES:
+            self._meta_cache.popitem(last=False)
+        return value
+    
+    def invalidate(self, prefix: Optional[Tuple] = None) -> None:
+        """메타데이터 캐시 무효화 (prefix가 없으면 전체, 있으면 해당 키로 시작하는 항목만)"""
+        if prefix is None:
+            self._meta_cache.clear()
+            return
+        for key in [k for k in self._meta_cache if k[:len(prefix)] == prefix]:
+            del self._meta_cache[key]
+    
+    def _get_bqstorage_client(self) -> bigquery_storage.BigQueryReadClient:
+        """Storage Read API 클라이언트를 처음 필요할 때 한 번만 생성하여 반환 (블로킹)"""
+        if self._bqstorage_client is None:
+            with self._bqstorage_client_lock:
+                if self._bqstorage_client is None:
+                    self._bqstorage_client = bigquery_storage.BigQueryReadClient(
+                        credentials=self.client._credentials
+                    )
+        return self._bqstorage_client
+    
+    def _fetch_result_rows(self, results, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+        """쿼리 결과를 최대 max_results 행까지 가져와 딕셔너리 목록으로 변환 (블로킹)"""
+        total_rows = results.total_rows or 0
+        num_rows = total_rows if max_results is None else min(total_rows, max_results)
+        
+        if num_rows > _STORAGE_API_ROW_THRESHOLD and num_rows == total_rows:
+            # 전체 결과가 필요한 대용량 결과는 Storage Read API로 Arrow 배치를 병렬 수신
+            arrow_table = results.to_arrow(bqstorage_client=self._get_bqstorage_client(), progress_bar_type=None)
+            return self._rows_to_dicts(arrow_table.to_pylist(), results.schema, num_rows)
+        
+        # 일부만 필요한 경우 REST 페이지를 필요한 만큼만 조회
+        return self._rows_to_dicts(itertools.islice(results, num_rows), results.schema, num_rows)
+    
+    @staticmethod
+    def _rows_to_dicts(rows, schema, num_rows: int) -> List[Dict[str, Any]]:
+        """
+        쿼리 결과 행(Row 또는 dict)을 JSON 직렬화 가능한 딕셔너리 목록으로 변환
+        
+        컬럼별 변환 함수를 스키마로 한 번만 결정하고, 행마다 값 타입을 검사하지 않습니다.
+        값은 row.values()로 위치 기반 접근하며, 변환이 필요한 컬럼만 따로 덮어씁니다.
+        결과 목록은 num_rows 크기로 미리 할당합니다.
+        """
+        names = tuple(field.name for field in schema)
+        converted = [
+            (field.name, converter)
+            for field in schema
+            if (converter := _value_converter(field)) is not _identity
+        ]
+        
+        row_dicts: List[Optional[Dict[str, Any]]] = [None] * num_rows
+        count = 0
+        for count, row in enumerate(rows, 1):
+            row_dict = dict(zip(names, row.values()))
+            for name, convert in converted:
+                row_dict[name] = convert(row_dict[name])
+            row_dicts[count - 1] = row_dict
+        
+        # total_rows보다 적게 수신된 경우 남은 자리 제거
+        del row_dicts[count:]
+        return row_dicts
     
     # 헬퍼 메서드를 클래스 상단부로 이동
     async def _get_all_datasets(self) -> List[Dict[str, Any]]:
-        """모든 데이터셋 정보를 가져오는 내부 헬퍼 메서드"""
-        result = await self.list_datasets()
-        if result.is_error:
+        """모든 데이터셋 정보를 가져오는 내부 헬퍼 메서드 (검색용 정규화 이름 id_lc 포함)"""
+        try:
+            return await self._cached(("all_datasets",), self._fetch_all_datasets)
+        except Exception as e:
+            logger.warning(f"Could not list datasets: {str(e)}")
             return []
-        return result.result.get("datasets", [])
+    
+    async def _fetch_all_datasets(self) -> List[Dict[str, Any]]:
+        """데이터셋 목록에 검색용 정규화 이름을 붙인 목록 생성 (list_datasets 캐시 항목은 변경하지 않음)"""
+        datasets = await self._cached(("datasets", False), self._fetch_datasets)
+        return [{**dataset, "id_lc": utils.default_process(dataset.get("id", ""))} for dataset in datasets]
     
     async def _get_all_tables(self) -> List[Dict[str, Any]]:
-        """모든 테이블 정보를 가져오는 내부 헬퍼 메서드"""
-        all_tables = []
+        """모든 테이블 정보를 가져오는 내부 헬퍼 메서드 (통합 목록을 TTL 동안 캐시)"""
+        return await self._cached(("all_tables",), self._fetch_all_tables)
+    
+    async def _fetch_all_tables(self) -> List[Dict[str, Any]]:
+        """모든 데이터셋의 테이블 목록을 모아 dataset_id를 붙인 통합 목록 생성"""
         datasets = await self._get_all_datasets()
+        dataset_ids = [dataset.get("id", "") for dataset in datasets if dataset.get("id", "")]
         
-        for dataset in datasets:
-            dataset_id = dataset.get("id", "")
-            if not dataset_id:
-                continue
-                
-            tables_result = await self.list_tables(dataset_id=dataset_id)
-            if tables_result.is_error:
+        # 데이터셋별 테이블 목록을 동시에 조회
+        tables_per_dataset = await asyncio.gather(
+            *(self._get_dataset_tables(dataset_id) for dataset_id in dataset_ids),
+            return_exceptions=True
+        )
+        
+        all_tables = []
+        for dataset_id, tables in zip(dataset_ids, tables_per_dataset):
+            if isinstance(tables, Exception):
+                logger.warning(f"Could not list tables in dataset {dataset_id}: {str(tables)}")
                 continue
                 
-            tables = tables_result.result.get("tables", [])
-            for table in tables:
-                table["dataset_id"] = dataset_id  # 데이터셋 ID 추가
-            
             all_tables.extend(tables)
             
         return all_tables
 
+    async def _get_dataset_tables(self, dataset_id: str) -> List[Dict[str, Any]]:
+        """한 데이터셋의 테이블 목록 (dataset_id와 검색용 정규화 이름 id_lc 포함)"""
+        tables = await self._cached(("tables", dataset_id, False), lambda: self._fetch_tables(dataset_id))
+        # 캐시된 항목을 변경하지 않도록 복사하여 추가
+        return [
+            {**table, "dataset_id": dataset_id, "id_lc": utils.default_process(table.get("id", ""))}
+            for table in tables
+        ]
+    
+    async def _get_schema_fields(self, dataset_id: str, table_id: str) -> List[Dict[str, Any]]:
+        """테이블 스키마의 필드 목록을 가져오는 내부 헬퍼 메서드 (검색용 정규화 이름/설명 name_lc, description_lc 포함)"""
+        return await self._cached(
+            ("schema_fields", dataset_id, table_id),
+            lambda: self._fetch_schema_fields(dataset_id, table_id)
+        )
+    
+    async def _fetch_schema_fields(self, dataset_id: str, table_id: str) -> List[Dict[str, Any]]:
+        """스키마 필드 목록에 검색용 정규화 문자열을 붙인 목록 생성 (get_table_schema 캐시 항목은 변경하지 않음)"""
+        table_info = await self._cached(
+            ("schema", dataset_id, table_id),
+            lambda: self._fetch_table_schema(dataset_id, table_id)
+        )
+        return [
+            {
+                **field,
+                "name_lc": utils.default_process(field.get("name", "")),
+                "description_lc": utils.default_process(field.get("description") or "")
+            }
+            for field in table_info.get("schema", [])
+        ]
+    
+    def _search_inventory(
+        self,
+        items: List[Dict[str, Any]],
+        keywords_lc: str,
+        min_similarity: float,
+        limit: int
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        인벤토리(id_lc를 가진 데이터셋/테이블 목록)에서 키워드와 유사한 상위 항목을 (항목, 점수)로 반환 (블로킹)
+        """
+        hits = self._extract_matches(keywords_lc, [item["id_lc"] for item in items], min_similarity, limit)
+        return [(items[idx], score) for _, score, idx in hits]
+    
+    @classmethod
+    def _score_fields(
+        cls,
+        keywords_lc: str,
+        fields: List[Dict[str, Any]],
+        min_similarity: float,
+        limit: int
+    ) -> List[Tuple[int, float]]:
+        """
+        필드 목록(name_lc, description_lc 포함)에서 키워드와 유사한 상위 필드의 (인덱스, 점수) 반환 (블로킹)
+        
+        점수는 이름과 설명 유사도의 가중 평균 (이름에 더 높은 가중치, 설명이 없으면 이름 점수만 사용)
+        """
+        field_names = [field["name_lc"] for field in fields]
+        field_descriptions = [field["description_lc"] for field in fields]
+        
+        # 설명 점수가 100이어도 기준에 못 미치는 이름 점수는 계산 도중 중단 (0점)
+        name_cutoff = max(0.0, (min_similarity - 30) / 0.7)
+        name_scores = cls._keyword_scores(keywords_lc, field_names, name_cutoff)
+        has_description = np.fromiter((bool(desc) for desc in field_descriptions), dtype=bool, count=len(field_descriptions))
+        overall_scores = np.where(has_description, name_scores * 0.7, name_scores)
+        
+        # 설명 점수는 설명이 있고 이름 점수로 통과 가능성이 남은 필드만, 필요한 최소 점수를 cutoff로 계산
+        for i in np.flatnonzero(has_description & (name_scores >= name_cutoff)):
+            desc_cutoff = (min_similarity - overall_scores[i]) / 0.3
+            if desc_cutoff > 100:
+                continue
+            desc_score = _SEARCH_SCORER(keywords_lc, field_descriptions[i], score_cutoff=max(0.0, desc_cutoff))
+            overall_scores[i] += desc_score * 0.3
+        
+        return cls._top_scores(overall_scores, min_similarity, limit)
+    
+    @staticmethod
+    def _extract_matches(keywords: str, choices: List[str], min_similarity: float, limit: int) -> List[Tuple[str, float, int]]:
+        """
+        정규화된 검색 키워드와 가장 유사한 후보 상위 limit개를 (후보, 점수, 인덱스) 목록으로 반환
+        (keywords와 choices는 utils.default_process로 미리 정규화된 문자열)
+        
+        process.extract가 score_cutoff 미만 후보를 계산 중 제외하고 상위 후보만 힙으로 유지하므로
+        전체 매치 목록을 만들어 정렬할 필요가 없습니다.
+        """
+        return process.extract(
+            keywords,
+            choices,
+            scorer=_SEARCH_SCORER,
+            limit=limit,
+            score_cutoff=min_similarity
+        )
+    
+    @staticmethod
+    def _keyword_scores(keywords: str, choices: List[str], score_cutoff: float = 0) -> np.ndarray:
+        """
+        정규화된 검색 키워드 전체와 후보 문자열들의 token_set_ratio 점수를 한 번에 계산(cdist)
+        
+        token_set_ratio가 토큰화/정렬/교집합 비교를 수행하므로 검색어별 점수를 따로 평균낼 필요가 없으며,
+        score_cutoff 미만인 후보는 계산 도중 중단되고 0점이 됩니다.
+        (점수는 반올림 없이 float64로 반환하여 기준 점수 비교와 결과 정밀도가 process.extract 결과와 일치)
+        """
+        if not choices:
+            return np.zeros(0)
+        return process.cdist(
+            [keywords],
+            choices,
+            scorer=_SEARCH_SCORER,
+            score_cutoff=score_cutoff,
+            dtype=np.float64,
+            workers=-1
+        )[0]
+    
+    @staticmethod
+    def _top_scores(scores: np.ndarray, min_similarity: float, limit: int) -> List[Tuple[int, float]]:
+        """기준 점수 이상인 후보 중 상위 limit개의 (인덱스, 점수)를 점수 내림차순으로 반환"""
+        candidates = np.flatnonzero(scores >= min_similarity)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in candidates]
+    
     @openapi_schema({
         "type": "function",
         "function": {
@@ -327,12 +780,12 @@ class BigQueryTool(Tool):
                 timeout_ms = 60000
             
             # 쿼리 실행 전 로그
-            log_message = f"Executing BigQuery query with max_results={max_results}, timeout_ms={timeout_ms}"
-            logger.info(log_message)
-            print(f"[BIGQUERY_QUERY] {log_message}", file=sys.stderr)  # Docker 로그에 출력
+            logger.debug("[BIGQUERY_QUERY] Executing BigQuery query with max_results=%s, timeout_ms=%s", max_results, timeout_ms)
+            
+            await self._ensure_client()
             
             # 쿼리 처리 시작 시간 기록
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # 쿼리 작업 구성
             job_config = bigquery.QueryJobConfig()
@@ -344,17 +797,12 @@ class BigQueryTool(Tool):
             except AttributeError:
                 logger.debug("maximum_bytes_billed not available in this API version")
             
-            try:
-                job_config.max_results = max_results
-            except AttributeError:
-                try:
-                    job_config.maximum_results = max_results
-                except AttributeError:
-                    logger.debug("Neither max_results nor maximum_results available")
+            # max_results는 QueryJobConfig 속성이 아니므로 결과를 읽을 때 적용함 (_fetch_result_rows)
             
-            # 쿼리 실행
+            # 쿼리 실행 (블로킹 RPC는 스레드에서 실행하여 이벤트 루프를 막지 않음)
             try:
-                query_job = self.client.query(
+                query_job = await asyncio.to_thread(
+                    self.client.query,
                     query,
                     job_config=job_config,
                     timeout=timeout_ms / 1000  # 밀리초를 초로 변환
@@ -367,7 +815,7 @@ class BigQueryTool(Tool):
             
             # 결과 가져오기
             try:
-                results = query_job.result()
+                results = await asyncio.to_thread(query_job.result)
             except Forbidden as e:
                 error_msg = f"Permission denied when fetching results: {str(e)}"
                 self._log_auth_info(f"[BIGQUERY_AUTH_ERROR] {error_msg}")
@@ -375,22 +823,11 @@ class BigQueryTool(Tool):
                 return self.fail_response(f"BigQuery 결과 가져오기 권한 부족: {error_msg}")
             
             # 쿼리 실행 시간 계산
-            query_time = time.time() - start_time
-            print(f"[BIGQUERY_QUERY_TIME] {query_time:.2f} seconds", file=sys.stderr)  # Docker 로그에 출력
-            
-            # 결과를 딕셔너리 목록으로 변환
-            rows = []
-            for row in results:
-                row_dict = {}
-                for key, value in row.items():
-                    # BigQuery의 특수 타입 처리 (TIMESTAMP, STRUCT 등)
-                    if hasattr(value, 'isoformat'):  # datetime 객체 처리
-                        row_dict[key] = value.isoformat()
-                    elif isinstance(value, (dict, list)):  # 중첩 구조 처리
-                        row_dict[key] = json.dumps(value)
-                    else:
-                        row_dict[key] = value
-                rows.append(row_dict)
+            query_time = time.perf_counter() - start_time
+            logger.debug("[BIGQUERY_QUERY_TIME] %.2f seconds", query_time)
+            
+            # 결과를 딕셔너리 목록으로 변환 (다음 페이지 조회 RPC가 발생하므로 스레드에서 실행)
+            rows = await asyncio.to_thread(self._fetch_result_rows, results, max_results)
             
             # 쿼리 메타데이터와 함께 결과 반환
             result_data = {
@@ -402,7 +839,7 @@ class BigQueryTool(Tool):
             }
             
             # 결과 수 로그
-            print(f"[BIGQUERY_RESULT] Query returned {len(rows)} rows in {query_time:.2f} seconds", file=sys.stderr)
+            logger.debug("[BIGQUERY_RESULT] Query returned %d rows in %.2f seconds", len(rows), query_time)
             
             return self.success_response(result_data)
             
@@ -421,14 +858,22 @@ class BigQueryTool(Tool):
             "description": "List all available datasets in the configured BigQuery project. This tool provides information about the datasets accessible to the service account, including dataset IDs and creation timestamps.",
             "parameters": {
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "include_details": {
+                        "type": "boolean",
+                        "description": "Also fetch per-dataset details such as location. This requires one extra request per dataset.",
+                        "default": False
+                    }
+                },
                 "required": []
             }
         }
     })
     @xml_schema(
         tag_name="bigquery-list-datasets",
-        mappings=[],
+        mappings=[
+            {"param_name": "include_details", "node_type": "attribute", "path": ".", "required": False}
+        ],
         example='''
         <!-- 
         The bigquery-list-datasets tool allows you to list all available datasets in the configured BigQuery project.
@@ -441,46 +886,30 @@ class BigQueryTool(Tool):
         <bigquery-list-datasets></bigquery-list-datasets>
         '''
     )
-    async def list_datasets(self) -> ToolResult:
+    async def list_datasets(self, include_details: bool = False) -> ToolResult:
         """
         List all available datasets in the configured BigQuery project.
         
         This function returns information about all datasets accessible to the 
         service account in the configured project, including dataset IDs and
         creation timestamps.
+        
+        Parameters:
+        - include_details: Whether to fetch per-dataset details (location)
         """
         try:
-            datasets = list(self.client.list_datasets())
+            include_details = _as_bool(include_details)
+            dataset_list = await self._cached(
+                ("datasets", include_details),
+                lambda: self._fetch_datasets(include_details)
+            )
             
-            if not datasets:
+            if not dataset_list:
                 return self.success_response({
                     "message": "No datasets found in project",
                     "datasets": []
                 })
             
-            dataset_list = []
-            for dataset in datasets:
-                # 데이터셋 정보 추출 (사용 가능한 속성만 추출)
-                dataset_info = {
-                    "id": dataset.dataset_id,
-                    "full_id": dataset.full_dataset_id
-                }
-                
-                # 옵션널 속성들 추가
-                if hasattr(dataset, 'friendly_name'):
-                    dataset_info["friendly_name"] = dataset.friendly_name
-                    
-                # 개별 데이터셋 정보를 가져와서 추가 정보 추출
-                try:
-                    # 데이터셋 상세 정보 가져오기
-                    full_dataset = self.client.get_dataset(dataset.reference)
-                    if hasattr(full_dataset, 'location') and full_dataset.location:
-                        dataset_info["location"] = full_dataset.location
-                except Exception as e:
-                    logger.warning(f"Could not get additional info for dataset {dataset.dataset_id}: {str(e)}")
-                
-                dataset_list.append(dataset_info)
-            
             return self.success_response({
                 "message": f"Found {len(dataset_list)} datasets",
                 "datasets": dataset_list
@@ -494,6 +923,49 @@ class BigQueryTool(Tool):
             logger.error(simplified_message)
             return self.fail_response(simplified_message)
     
+    async def _fetch_datasets(self, include_details: bool = False) -> List[Dict[str, Any]]:
+        """
+        프로젝트의 데이터셋 정보를 BigQuery에서 조회 (캐시 미적용)
+        
+        include_details가 False이면 list_datasets 결과만 사용하고,
+        True이면 데이터셋별 get_dataset을 동시에 요청해 location을 추가합니다.
+        """
+        await self._ensure_client()
+        datasets = await asyncio.to_thread(lambda: list(self.client.list_datasets()))
+        
+        if include_details:
+            # 데이터셋 상세 정보(get_dataset)는 순차 호출 대신 동시에 요청
+            full_datasets = await asyncio.gather(
+                *(asyncio.to_thread(self.client.get_dataset, dataset.reference) for dataset in datasets),
+                return_exceptions=True
+            )
+        else:
+            full_datasets = [None] * len(datasets)
+        
+        dataset_list = []
+        for dataset, full_dataset in zip(datasets, full_datasets):
+            # 데이터셋 정보 추출 (사용 가능한 속성만 추출)
+            dataset_info = {
+                "id": dataset.dataset_id,
+                "full_id": dataset.full_dataset_id
+            }
+            
+            # 옵션널 속성들 추가
+            if hasattr(dataset, 'friendly_name'):
+                dataset_info["friendly_name"] = dataset.friendly_name
+                
+            # 개별 데이터셋 상세 정보에서 추가 정보 추출
+            if full_dataset is None:
+                pass
+            elif isinstance(full_dataset, Exception):
+                logger.warning(f"Could not get additional info for dataset {dataset.dataset_id}: {str(full_dataset)}")
+            elif getattr(full_dataset, 'location', None):
+                dataset_info["location"] = full_dataset.location
+            
+            dataset_list.append(dataset_info)
+        
+        return dataset_list
+    
     @openapi_schema({
         "type": "function",
         "function": {
@@ -505,6 +977,11 @@ class BigQueryTool(Tool):
                     "dataset_id": {
                         "type": "string",
                         "description": "The ID of the dataset to list tables from. Do not include the project ID."
+                    },
+                    "include_details": {
+                        "type": "boolean",
+                        "description": "Also fetch per-table details such as row count, size and last modified time. This requires one extra request per table.",
+                        "default": False
                     }
                 },
                 "required": ["dataset_id"]
@@ -514,7 +991,8 @@ class BigQueryTool(Tool):
     @xml_schema(
         tag_name="bigquery-list-tables",
         mappings=[
-            {"param_name": "dataset_id", "node_type": "attribute", "path": "."}
+            {"param_name": "dataset_id", "node_type": "attribute", "path": "."},
+            {"param_name": "include_details", "node_type": "attribute", "path": ".", "required": False}
         ],
         example='''
         <!-- 
@@ -528,7 +1006,7 @@ class BigQueryTool(Tool):
         <bigquery-list-tables dataset_id="analytics_data"></bigquery-list-tables>
         '''
     )
-    async def list_tables(self, dataset_id: str) -> ToolResult:
+    async def list_tables(self, dataset_id: str, include_details: bool = False) -> ToolResult:
         """
         List all tables in a specified BigQuery dataset.
         
@@ -537,61 +1015,24 @@ class BigQueryTool(Tool):
         
         Parameters:
         - dataset_id: The ID of the dataset to list tables from
+        - include_details: Whether to fetch per-table details (row count, size, timestamps)
         """
         try:
             if not dataset_id:
                 return self.fail_response("A valid dataset ID is required.")
             
-            dataset_ref = self.client.dataset(dataset_id)
-            tables = list(self.client.list_tables(dataset_ref))
+            include_details = _as_bool(include_details)
+            table_list = await self._cached(
+                ("tables", dataset_id, include_details),
+                lambda: self._fetch_tables(dataset_id, include_details)
+            )
             
-            if not tables:
+            if not table_list:
                 return self.success_response({
                     "message": f"No tables found in dataset '{dataset_id}'",
                     "tables": []
                 })
             
-            table_list = []
-            for table in tables:
-                try:
-                    # 테이블 정보 가져오기
-                    table_ref = self.client.get_table(table.reference)
-                    
-                    # 기본 테이블 정보
-                    table_info = {
-                        "id": table.table_id,
-                        "full_id": f"{self.project_id}.{dataset_id}.{table.table_id}"
-                    }
-                    
-                    # 테이블 타입
-                    if hasattr(table, 'table_type'):
-                        table_info["type"] = table.table_type
-                    
-                    # 테이블 행 수
-                    if hasattr(table_ref, 'num_rows'):
-                        table_info["num_rows"] = table_ref.num_rows
-                    
-                    # 테이블 크기
-                    if hasattr(table_ref, 'num_bytes'):
-                        table_info["size_bytes"] = table_ref.num_bytes
-                    
-                    # 생성 시간
-                    if hasattr(table_ref, 'created') and table_ref.created:
-                        table_info["creation_time"] = table_ref.created.isoformat()
-                    
-                    # 수정 시간
-                    if hasattr(table_ref, 'modified') and table_ref.modified:
-                        table_info["last_modified"] = table_ref.modified.isoformat()
-                    
-                    table_list.append(table_info)
-                except Exception as e:
-                    logger.warning(f"Could not get full details for table {table.table_id}: {str(e)}")
-                    # 기본 정보만 추가
-                    table_list.append({
-                        "id": table.table_id,
-                        "full_id": f"{self.project_id}.{dataset_id}.{table.table_id}"
-                    })
-            
             return self.success_response({
                 "message": f"Found {len(table_list)} tables in dataset '{dataset_id}'",
                 "tables": table_list
@@ -605,6 +1046,63 @@ class BigQueryTool(Tool):
             logger.error(simplified_message)
             return self.fail_response(simplified_message)
     
+    async def _fetch_tables(self, dataset_id: str, include_details: bool = False) -> List[Dict[str, Any]]:
+        """
+        데이터셋의 테이블 정보를 BigQuery에서 조회 (캐시 미적용)
+        
+        include_details가 False이면 list_tables의 TableListItem 속성(타입, 생성 시간)만 사용하고,
+        True이면 테이블별 get_table을 동시에 요청해 행 수, 크기, 수정 시간을 추가합니다.
+        """
+        await self._ensure_client()
+        dataset_ref = self.client.dataset(dataset_id)
+        tables = await asyncio.to_thread(lambda: list(self.client.list_tables(dataset_ref)))
+        
+        if include_details:
+            # 테이블 상세 정보(get_table)는 순차 호출 대신 동시에 요청
+            table_refs = await asyncio.gather(
+                *(asyncio.to_thread(self.client.get_table, table.reference) for table in tables),
+                return_exceptions=True
+            )
+        else:
+            table_refs = [None] * len(tables)
+        
+        table_list = []
+        for table, table_ref in zip(tables, table_refs):
+            # 기본 테이블 정보 (TableListItem에서 바로 얻을 수 있는 값)
+            table_info = {
+                "id": table.table_id,
+                "full_id": f"{self.project_id}.{dataset_id}.{table.table_id}"
+            }
+            
+            # 테이블 타입
+            if getattr(table, 'table_type', None):
+                table_info["type"] = table.table_type
+            
+            # 생성 시간
+            created = getattr(table, 'created', None)
+            if created:
+                table_info["creation_time"] = created.isoformat()
+            
+            if isinstance(table_ref, Exception):
+                logger.warning(f"Could not get full details for table {table.table_id}: {str(table_ref)}")
+            elif table_ref is not None:
+                # 테이블 행 수
+                if hasattr(table_ref, 'num_rows'):
+                    table_info["num_rows"] = table_ref.num_rows
+                
+                # 테이블 크기
+                if hasattr(table_ref, 'num_bytes'):
+                    table_info["size_bytes"] = table_ref.num_bytes
+                
+                # 수정 시간
+                modified = getattr(table_ref, 'modified', None)
+                if modified:
+                    table_info["last_modified"] = modified.isoformat()
+            
+            table_list.append(table_info)
+        
+        return table_list
+    
     @openapi_schema({
         "type": "function",
         "function": {
@@ -660,45 +1158,16 @@ class BigQueryTool(Tool):
                 return self.fail_response("유효한 데이터셋 ID와 테이블 ID가 필요합니다.")
             
             try:
-                table_ref = self.client.dataset(dataset_id).table(table_id)
-                table = self.client.get_table(table_ref)
+                table_info = await self._cached(
+                    ("schema", dataset_id, table_id),
+                    lambda: self._fetch_table_schema(dataset_id, table_id)
+                )
             except Exception as e:
                 if "404" in str(e) or "Not found" in str(e):
                     return self.fail_response(f"테이블을 찾을 수 없습니다: {self.project_id}.{dataset_id}.{table_id}. 테이블 ID가 정확한지 확인하거나 테이블 접근 권한을 확인하세요.")
                 else:
                     raise
             
-            # 스키마 정보 추출 함수 (재귀적으로 중첩 필드 처리)
-            def extract_field_info(field):
-                field_info = {
-                    "name": field.name,
-                    "type": field.field_type,
-                    "mode": field.mode,
-                    "description": field.description
-                }
-                
-                # 중첩 필드 처리
-                if field.field_type == "RECORD" and field.fields:
-                    nested_fields = []
-                    for nested_field in field.fields:
-                        nested_fields.append(extract_field_info(nested_field))
-                    field_info["fields"] = nested_fields
-                
-                return field_info
-            
-            schema_fields = [extract_field_info(field) for field in table.schema]
-            
-            table_info = {
-                "full_id": f"{self.project_id}.{dataset_id}.{table_id}",
-                "description": table.description,
-                "num_rows": table.num_rows,
-                "size_bytes": table.num_bytes,
-                "type": table.table_type if hasattr(table, 'table_type') else None,
-                "creation_time": table.created.isoformat() if hasattr(table, 'created') and table.created else None,
-                "last_modified": table.modified.isoformat() if hasattr(table, 'modified') and table.modified else None,
-                "schema": schema_fields
-            }
-            
             return self.success_response(table_info)
             
         except Exception as e:
@@ -708,7 +1177,43 @@ class BigQueryTool(Tool):
                 simplified_message += "..."
             logger.error(simplified_message)
             return self.fail_response(simplified_message)
-
+    
+    async def _fetch_table_schema(self, dataset_id: str, table_id: str) -> Dict[str, Any]:
+        """테이블 메타데이터와 스키마를 BigQuery에서 조회 (캐시 미적용)"""
+        await self._ensure_client()
+        table_ref = self.client.dataset(dataset_id).table(table_id)
+        table = await asyncio.to_thread(self.client.get_table, table_ref)
+        
+        # 스키마 정보 추출 함수 (재귀적으로 중첩 필드 처리)
+        def extract_field_info(field):
+            field_info = {
+                "name": field.name,
+                "type": field.field_type,
+                "mode": field.mode,
+                "description": field.description
+            }
+            
+            # 중첩 필드 처리
+            if field.field_type == "RECORD" and field.fields:
+                nested_fields = []
+                for nested_field in field.fields:
+                    nested_fields.append(extract_field_info(nested_field))
+                field_info["fields"] = nested_fields
+            
+            return field_info
+        
+        schema_fields = [extract_field_info(field) for field in table.schema]
+        
+        return {
+            "full_id": f"{self.project_id}.{dataset_id}.{table_id}",
+            "description": table.description,
+            "num_rows": table.num_rows,
+            "size_bytes": table.num_bytes,
+            "type": getattr(table, 'table_type', None),
+            "creation_time": _isoformat(getattr(table, 'created', None)),
+            "last_modified": _isoformat(getattr(table, 'modified', None)),
+            "schema": schema_fields
+        }
 
     @openapi_schema({
         "type": "function",
@@ -774,7 +1279,7 @@ class BigQueryTool(Tool):
         self,
         keywords: str,
         resource_type: str = "all",
-        min_similarity: int = 60,
+        min_similarity: int = _DEFAULT_MIN_SIMILARITY,
         max_results: int = 10
     ) -> ToolResult:
         """
@@ -793,8 +1298,7 @@ class BigQueryTool(Tool):
                 return self.fail_response("유효한 검색 키워드가 필요합니다.")
             
             # 리소스 타입 유효성 검사
-            valid_resource_types = ["dataset", "table", "field", "all"]
-            if resource_type not in valid_resource_types:
+            if resource_type not in _RESOURCE_TYPES:
                 return self.fail_response(f"유효하지 않은 resource_type: {resource_type}. 'dataset', 'table', 'field', 'all' 중 하나여야 합니다.")
             
             # 유사도 점수 정규화
@@ -803,158 +1307,122 @@ class BigQueryTool(Tool):
             # 결과 수 정규화
             max_results = max(1, min(50, max_results))
             
-            # 키워드 전처리
-            keywords = keywords.lower()
-            search_terms = keywords.split()
+            # 키워드 전처리 (후보 이름은 인벤토리 캐시 시점에 이미 정규화되어 있으므로 키워드만 한 번 정규화)
+            keywords = keywords.strip()
+            keywords_lc = utils.default_process(keywords)
             
             results = {}
+            all_tables = None
             
             # 데이터셋 검색
-            if resource_type in ["dataset", "all"]:
+            if resource_type in _SEARCH_DATASETS:
                 datasets = await self._get_all_datasets()
-                dataset_matches = []
                 
-                for dataset in datasets:
-                    dataset_id = dataset.get("id", "")
-                    dataset_name = dataset_id.lower()
-                    
-                    # 유사도 계산 (각 검색어에 대한 최대 유사도 점수 사용)
-                    similarity_scores = []
-                    for term in search_terms:
-                        term_similarity = fuzz.partial_ratio(term, dataset_name)
-                        similarity_scores.append(term_similarity)
-                    
-                    # 평균 유사도 점수
-                    avg_similarity = sum(similarity_scores) / len(similarity_scores) if similarity_scores else 0
-                    
-                    if avg_similarity >= min_similarity:
-                        dataset_matches.append({
-                            "id": dataset_id,
-                            "full_id": dataset.get("full_id", ""),
-                            "type": "dataset",
-                            "similarity": avg_similarity
-                        })
-                
-                # 유사도 점수로 정렬
-                dataset_matches.sort(key=lambda x: x["similarity"], reverse=True)
-                results["datasets"] = dataset_matches[:max_results]
+                # 기준 점수 미만 후보는 점수 계산 중 제외되고, 상위 max_results개만 힙으로 유지됨
+                results["datasets"] = [
+                    {
+                        "id": dataset.get("id", ""),
+                        "full_id": dataset.get("full_id", ""),
+                        "type": "dataset",
+                        "similarity": score
+                    }
+                    for dataset, score in await asyncio.to_thread(
+                        self._search_inventory, datasets, keywords_lc, min_similarity, max_results
+                    )
+                ]
             
             # 테이블 검색
             table_matches = []
-            if resource_type in ["table", "all"]:
+            if resource_type in _SEARCH_TABLES:
                 # 모든 데이터셋에서 테이블 가져오기
                 all_tables = await self._get_all_tables()
                 
-                for table in all_tables:
-                    table_id = table.get("id", "")
-                    dataset_id = table.get("dataset_id", "")
-                    full_id = table.get("full_id", "")
-                    table_name = table_id.lower()
-                    
-                    # 유사도 계산
-                    similarity_scores = []
-                    for term in search_terms:
-                        term_similarity = fuzz.partial_ratio(term, table_name)
-                        similarity_scores.append(term_similarity)
-                    
-                    avg_similarity = sum(similarity_scores) / len(similarity_scores) if similarity_scores else 0
-                    
-                    if avg_similarity >= min_similarity:
-                        table_matches.append({
-                            "id": table_id,
-                            "dataset_id": dataset_id,
-                            "full_id": full_id,
-                            "type": "table",
-                            "similarity": avg_similarity
-                        })
-                
-                # 유사도 점수로 정렬
-                table_matches.sort(key=lambda x: x["similarity"], reverse=True)
-                results["tables"] = table_matches[:max_results]
+                table_matches = [
+                    {
+                        "id": table.get("id", ""),
+                        "dataset_id": table.get("dataset_id", ""),
+                        "full_id": table.get("full_id", ""),
+                        "type": "table",
+                        "similarity": score
+                    }
+                    for table, score in await asyncio.to_thread(
+                        self._search_inventory, all_tables, keywords_lc, min_similarity, max_results
+                    )
+                ]
+                results["tables"] = table_matches
             
             # 필드 검색
-            field_matches = []
-            if resource_type in ["field", "all"]:
+            if resource_type in _SEARCH_FIELDS:
                 # 검색된 테이블 또는 모든 테이블에서 필드 가져오기
-                tables_to_check = table_matches[:min(5, len(table_matches))] if table_matches else all_tables[:min(10, len(all_tables)) if 'all_tables' in locals() else 0]
+                if table_matches:
+                    tables_to_check = table_matches[:5]
+                else:
+                    if all_tables is None:
+                        all_tables = await self._get_all_tables()
+                    tables_to_check = all_tables[:10]
                 
-                for table in tables_to_check:
-                    try:
-                        table_id = table.get("id", "")
-                        dataset_id = table.get("dataset_id", "")
-                        
-                        # 테이블 스키마 가져오기
-                        schema_result = await self.get_table_schema(dataset_id=dataset_id, table_id=table_id)
-                        if schema_result.is_error:
-                            continue
-                        
-                        schema_fields = schema_result.result.get("schema", [])
-                        
-                        for field in schema_fields:
-                            field_name = field.get("name", "").lower()
-                            field_description = field.get("description", "").lower()
-                            
-                            # 필드 이름과 설명에 대한 유사도 계산
-                            name_scores = []
-                            desc_scores = []
-                            
-                            for term in search_terms:
-                                name_score = fuzz.partial_ratio(term, field_name)
-                                name_scores.append(name_score)
-                                
-                                if field_description:
-                                    desc_score = fuzz.partial_ratio(term, field_description)
-                                    desc_scores.append(desc_score)
-                            
-                            avg_name_similarity = sum(name_scores) / len(name_scores) if name_scores else 0
-                            avg_desc_similarity = sum(desc_scores) / len(desc_scores) if desc_scores else 0
-                            
-                            # 이름과 설명 유사도의 가중 평균 (이름에 더 높은 가중치)
-                            overall_similarity = (avg_name_similarity * 0.7) + (avg_desc_similarity * 0.3) if desc_scores else avg_name_similarity
-                            
-                            if overall_similarity >= min_similarity:
-                                field_matches.append({
-                                    "name": field.get("name", ""),
-                                    "type": field.get("type", ""),
-                                    "mode": field.get("mode", ""),
-                                    "description": field.get("description", ""),
-                                    "table_id": table_id,
-                                    "dataset_id": dataset_id,
-                                    "full_reference": f"{dataset_id}.{table_id}.{field.get('name', '')}",
-                                    "resource_type": "field",
-                                    "similarity": overall_similarity
-                                })
-                    except Exception as e:
-                        logger.warning(f"필드 정보 추출 중 오류: {str(e)}")
+                # 테이블 스키마를 동시에 조회
+                schemas = await asyncio.gather(
+                    *(self._get_schema_fields(table.get("dataset_id", ""), table.get("id", "")) for table in tables_to_check),
+                    return_exceptions=True
+                )
+                
+                # 대상 테이블의 필드를 하나의 목록으로 펼치고 (테이블, 필드) 위치를 기억
+                field_refs = []
+                for table, schema_fields in zip(tables_to_check, schemas):
+                    if isinstance(schema_fields, Exception):
+                        logger.warning(f"필드 정보 추출 중 오류: {str(schema_fields)}")
                         continue
+                    table_id = table.get("id", "")
+                    dataset_id = table.get("dataset_id", "")
+                    field_refs.extend((dataset_id, table_id, field) for field in schema_fields)
                 
-                # 유사도 점수로 정렬
-                field_matches.sort(key=lambda x: x["similarity"], reverse=True)
-                results["fields"] = field_matches[:max_results]
-            
-            # 통합 결과 생성
-            all_matches = []
-            for resource_type, matches in results.items():
-                if matches:
-                    all_matches.extend(matches)
+                # 점수 계산은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 수행
+                top_fields = await asyncio.to_thread(
+                    self._score_fields,
+                    keywords_lc,
+                    [field for _, _, field in field_refs],
+                    min_similarity,
+                    max_results
+                )
+                
+                field_matches = []
+                for i, score in top_fields:
+                    dataset_id, table_id, field = field_refs[i]
+                    field_matches.append({
+                        "name": field.get("name", ""),
+                        "type": field.get("type", ""),
+                        "mode": field.get("mode", ""),
+                        "description": field.get("description", ""),
+                        "table_id": table_id,
+                        "dataset_id": dataset_id,
+                        "full_reference": f"{dataset_id}.{table_id}.{field.get('name', '')}",
+                        "resource_type": "field",
+                        "similarity": score
+                    })
+                results["fields"] = field_matches
             
-            # 전체 결과를 유사도 점수로 정렬
-            all_matches.sort(key=lambda x: x["similarity"], reverse=True)
+            # 통합 결과 생성 (리소스별 결과는 이미 유사도 내림차순이므로 다시 정렬하지 않고 병합)
+            total_matches = sum(len(matches) for matches in results.values())
+            top_matches = list(itertools.islice(
+                heapq.merge(*results.values(), key=itemgetter("similarity"), reverse=True),
+                max_results
+            ))
             
-            if not all_matches:
+            if not top_matches:
                 return self.success_response({
                     "message": f"키워드 '{keywords}'에 대한 검색 결과가 없습니다. 다른 키워드를 시도해 보세요.",
                     "results": []
                 })
             
             return self.success_response({
-                "message": f"키워드 '{keywords}'에 대한 검색 결과 {len(all_matches)}개를 찾았습니다.",
+                "message": f"키워드 '{keywords}'에 대한 검색 결과 {total_matches}개를 찾았습니다.",
                 "search_params": {
                     "keywords": keywords,
                     "resource_type": resource_type,
                     "min_similarity": min_similarity
                 },
-                "results": all_matches[:max_results]
+                "results": top_matches
             })
             
         except Exception as e:
@@ -1041,52 +1509,63 @@ class BigQueryTool(Tool):
             
             # 1. 키워드 추출 및 관련 데이터셋/테이블 검색
             keywords = description.lower()
+            keywords_lc = utils.default_process(description)
             dataset_matches = []
             table_matches = []
             field_info = {}
             
             # 데이터셋 힌트가 있는 경우 해당 데이터셋 사용
+            datasets = await self._get_all_datasets()
             if dataset_hint:
-                try:
-                    datasets = await self._get_all_datasets()
-                    for dataset in datasets:
-                        if dataset_hint.lower() in dataset.get("id", "").lower():
-                            dataset_matches.append(dataset)
-                            break
-                except Exception as e:
-                    logger.warning(f"데이터셋 힌트 처리 중 오류: {str(e)}")
+                for dataset in datasets:
+                    if dataset_hint.lower() in dataset.get("id", "").lower():
+                        dataset_matches.append(dataset)
+                        break
             
             # 데이터셋을 찾지 못했으면 검색
             if not dataset_matches:
-                search_result = await self.search_resources(keywords=description, resource_type="dataset", max_results=3)
-                if not search_result.is_error and search_result.result.get("results"):
-                    dataset_matches = search_result.result.get("results")
+                dataset_matches = [
+                    dataset for dataset, _ in await asyncio.to_thread(
+                        self._search_inventory, datasets, keywords_lc, _DEFAULT_MIN_SIMILARITY, 3
+                    )
+                ]
+            
+            # 매칭된 데이터셋의 테이블 (테이블 힌트 조회, 데이터셋 힌트가 있을 때의 키워드 검색 후보로 사용)
+            candidate_tables = []
+            if dataset_matches and (table_hint or dataset_hint):
+                try:
+                    tables_per_dataset = await asyncio.gather(
+                        *(self._get_dataset_tables(dataset.get("id", "")) for dataset in dataset_matches)
+                    )
+                    candidate_tables = [table for tables in tables_per_dataset for table in tables]
+                except Exception as e:
+                    logger.warning(f"데이터셋 테이블 조회 중 오류: {str(e)}")
             
             # 테이블 힌트가 있는 경우 해당 테이블 사용
             if table_hint:
                 try:
-                    all_tables = []
-                    if dataset_matches:
-                        for dataset in dataset_matches:
-                            dataset_id = dataset.get("id", "")
-                            tables_result = await self.list_tables(dataset_id=dataset_id)
-                            if not tables_result.is_error:
-                                all_tables.extend(tables_result.result.get("tables", []))
-                    else:
-                        all_tables = await self._get_all_tables()
-                    
-                    for table in all_tables:
+                    hint_tables = candidate_tables or await self._get_all_tables()
+                    for table in hint_tables:
                         if table_hint.lower() in table.get("id", "").lower():
                             table_matches.append(table)
                             break
                 except Exception as e:
                     logger.warning(f"테이블 힌트 처리 중 오류: {str(e)}")
             
-            # 테이블을 찾지 못했으면 검색
+            # 테이블을 찾지 못했으면 검색 (데이터셋 힌트가 있으면 해당 데이터셋의 테이블에서 먼저 검색)
+            if not table_matches and dataset_hint and candidate_tables:
+                hits = await asyncio.to_thread(
+                    self._extract_matches,
+                    keywords_lc, [table["id_lc"] for table in candidate_tables], _DEFAULT_MIN_SIMILARITY, 3
+                )
+                table_matches = [candidate_tables[index] for _, _, index in hits]
+            
             if not table_matches:
-                search_result = await self.search_resources(keywords=description, resource_type="table", max_results=3)
-                if not search_result.is_error and search_result.result.get("results"):
-                    table_matches = search_result.result.get("results")
+                table_matches = [
+                    table for table, _ in await asyncio.to_thread(
+                        self._search_inventory, await self._get_all_tables(), keywords_lc, _DEFAULT_MIN_SIMILARITY, 3
+                    )
+                ]
             
             # 매칭되는 테이블이 없으면 실패
             if not table_matches:
@@ -1095,19 +1574,16 @@ class BigQueryTool(Tool):
                     "더 구체적인 설명이나 테이블 힌트를 제공해 주세요."
                 )
             
-            # 2. 각 테이블의 스키마 정보 수집
-            for table in table_matches:
-                table_id = table.get("id", "")
-                dataset_id = table.get("dataset_id", "")
-                
-                # 스키마 가져오기
-                try:
-                    schema_result = await self.get_table_schema(dataset_id=dataset_id, table_id=table_id)
-                    if not schema_result.is_error:
-                        schema_fields = schema_result.result.get("schema", [])
-                        field_info[f"{dataset_id}.{table_id}"] = schema_fields
-                except Exception as e:
-                    logger.warning(f"스키마 정보 수집 중 오류: {str(e)}")
+            # 2. 각 테이블의 스키마 정보를 동시에 수집
+            schemas = await asyncio.gather(
+                *(self._get_schema_fields(table.get("dataset_id", ""), table.get("id", "")) for table in table_matches),
+                return_exceptions=True
+            )
+            for table, schema_fields in zip(table_matches, schemas):
+                if isinstance(schema_fields, Exception):
+                    logger.warning(f"스키마 정보 수집 중 오류: {str(schema_fields)}")
+                    continue
+                field_info[f"{table.get('dataset_id', '')}.{table.get('id', '')}"] = schema_fields
             
             # 3. 쿼리 생성 로직
             # 대부분의 경우에는 하나의 주요 테이블을 사용
@@ -1119,48 +1595,42 @@ class BigQueryTool(Tool):
             # 필요한 필드 결정
             fields = field_info.get(f"{main_dataset_id}.{main_table_id}", [])
             
-            # 시간 관련 필드 식별
-            date_fields = [field.get("name") for field in fields if field.get("type") in ["DATE", "DATETIME", "TIMESTAMP"]]
-            
-            # 집계 관련 키워드 확인
-            count_keywords = ["count", "세기", "개수", "숫자", "횟수"]
-            sum_keywords = ["sum", "total", "합계", "합산"]
-            avg_keywords = ["average", "avg", "평균"]
-            
-            has_count = any(keyword in keywords for keyword in count_keywords)
-            has_sum = any(keyword in keywords for keyword in sum_keywords)
-            has_avg = any(keyword in keywords for keyword in avg_keywords)
+            # 시간 관련 필드와 숫자 필드를 한 번에 식별
+            date_fields = []
+            numeric_fields = []
+            for field in fields:
+                field_type = field.get("type")
+                if field_type in _DATE_FIELD_TYPES:
+                    date_fields.append(field.get("name"))
+                elif field_type in _NUMERIC_FIELD_TYPES:
+                    numeric_fields.append(field.get("name"))
             
-            # 날짜/기간 관련 키워드 확인
-            date_keywords = ["일별", "날짜별", "날짜", "일자", "day", "daily", "per day", "by date"]
-            month_keywords = ["월별", "월간", "month", "monthly", "per month", "by month"]
-            year_keywords = ["연도별", "연간", "year", "yearly", "annual", "by year"]
+            # 집계/날짜 그룹/기간/정렬 키워드를 한 번의 스캔으로 확인
+            labels = _keyword_labels(keywords)
             
-            has_date_grouping = any(keyword in keywords for keyword in date_keywords)
-            has_month_grouping = any(keyword in keywords for keyword in month_keywords)
-            has_year_grouping = any(keyword in keywords for keyword in year_keywords)
+            has_count = "count" in labels
+            has_sum = "sum" in labels
+            has_avg = "avg" in labels
             
-            # 기간 제한 키워드 확인
-            recent_keywords = ["recent", "last", "최근"]
-            day_period_keywords = ["days", "일간"]
-            month_period_keywords = ["months", "개월"]
-            year_period_keywords = ["years", "연간"]
+            has_date_grouping = "date_group" in labels
+            has_month_grouping = "month_group" in labels
+            has_year_grouping = "year_group" in labels
             
-            # 정렬 관련 키워드 확인
-            sort_desc_keywords = ["top", "highest", "most", "상위", "많은"]
-            sort_asc_keywords = ["bottom", "lowest", "least", "하위", "적은"]
+            has_recent = "recent" in labels
+            has_day_period = "day_period" in labels
+            has_month_period = "month_period" in labels
+            has_year_period = "year_period" in labels
             
-            has_desc_sort = any(keyword in keywords for keyword in sort_desc_keywords)
-            has_asc_sort = any(keyword in keywords for keyword in sort_asc_keywords)
+            has_desc_sort = "sort_desc" in labels
+            has_asc_sort = "sort_asc" in labels
             
             # 숫자 추출 (예: "지난 30일")
-            import re
-            num_matches = re.findall(r'\b(\d+)\s*(?:days|day|months|month|years|year|일|개월|년|주|weeks|week)\b', description)
-            period_num = int(num_matches[0]) if num_matches else 30  # 기본값은 30일
+            period_match = _PERIOD_RE.search(description)
+            period_num = int(period_match.group(1)) if period_match else 30  # 기본값은 30일
             
             # 제한 개수 추출 (예: "상위 10개")
-            limit_matches = re.findall(r'\b(?:top|상위|하위)\s*(\d+)\b', description)
-            limit_num = int(limit_matches[0]) if limit_matches else 10  # 기본값은 10개
+            limit_match = _LIMIT_RE.search(description)
+            limit_num = int(limit_match.group(1)) if limit_match else 10  # 기본값은 10개
             
             # 쿼리 구성 요소 초기화
             select_clause = []
@@ -1171,41 +1641,38 @@ class BigQueryTool(Tool):
             limit_clause = f"LIMIT {limit_num}" if has_desc_sort or has_asc_sort else ""
             
             # 날짜 필드가 있고 최근 데이터를 요청한 경우 WHERE 절 추가
-            if date_fields and any(keyword in keywords for keyword in recent_keywords):
+            if date_fields and has_recent:
                 date_field = date_fields[0]  # 첫 번째 날짜 필드 사용
                 
                 # 기간 유형 결정
-                if any(keyword in keywords for keyword in day_period_keywords):
+                if has_day_period:
                     where_clause.append(f"{date_field} >= DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} DAY)")
-                elif any(keyword in keywords for keyword in month_period_keywords):
+                elif has_month_period:
                     where_clause.append(f"{date_field} >= DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} MONTH)")
-                elif any(keyword in keywords for keyword in year_period_keywords):
+                elif has_year_period:
                     where_clause.append(f"{date_field} >= DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} YEAR)")
                 else:
                     # 기본은 일 단위
                     where_clause.append(f"{date_field} >= DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} DAY)")
             
             # 특별한 경우: GA 테이블 이름에 날짜가 포함된 경우 (_TABLE_SUFFIX 사용)
-            ga_pattern = re.compile(r'^ga_.*sessions.*$', re.IGNORECASE)
-            if ga_pattern.match(main_table_id):
+            if _GA_SESSIONS_TABLE_RE.match(main_table_id):
                 # GA 테이블이므로 _TABLE_SUFFIX 사용
                 from_clause = f"`{self.project_id}.{main_dataset_id}.{main_table_id.split('_')[0]}_sessions_*`"
                 
-                if any(keyword in keywords for keyword in recent_keywords):
+                if has_recent:
                     # 기간 유형 결정
-                    if any(keyword in keywords for keyword in day_period_keywords):
+                    if has_day_period:
                         where_clause.append(f"_TABLE_SUFFIX BETWEEN FORMAT_DATE('%Y%m%d', DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} DAY)) AND FORMAT_DATE('%Y%m%d', CURRENT_DATE())")
-                    elif any(keyword in keywords for keyword in month_period_keywords):
+                    elif has_month_period:
                         where_clause.append(f"_TABLE_SUFFIX BETWEEN FORMAT_DATE('%Y%m%d', DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} MONTH)) AND FORMAT_DATE('%Y%m%d', CURRENT_DATE())")
-                    elif any(keyword in keywords for keyword in year_period_keywords):
+                    elif has_year_period:
                         where_clause.append(f"_TABLE_SUFFIX BETWEEN FORMAT_DATE('%Y%m%d', DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} YEAR)) AND FORMAT_DATE('%Y%m%d', CURRENT_DATE())")
                     else:
                         # 기본은 일 단위
                         where_clause.append(f"_TABLE_SUFFIX BETWEEN FORMAT_DATE('%Y%m%d', DATE_SUB(CURRENT_DATE(), INTERVAL {period_num} DAY)) AND FORMAT_DATE('%Y%m%d', CURRENT_DATE())")
             
             # SELECT 및 GROUP BY 절 구성
-            numeric_fields = [field.get("name") for field in fields if field.get("type") in ["INTEGER", "FLOAT", "NUMERIC"]]
-            
             if has_date_grouping and date_fields:
                 date_field = date_fields[0]
                 select_clause.append(date_field)
@@ -1250,20 +1717,22 @@ class BigQueryTool(Tool):
                 # DESC를 ASC로 변경
                 order_by_clause = [clause.replace("DESC", "ASC") for clause in order_by_clause]
             
-            # 쿼리 조합
-            query = f"SELECT {', '.join(select_clause)}\nFROM {from_clause}"
+            # 쿼리 조합 (절 목록을 모아 한 번에 연결)
+            query_parts = [f"SELECT {', '.join(select_clause)}", f"FROM {from_clause}"]
             
             if where_clause:
-                query += f"\nWHERE {' AND '.join(where_clause)}"
+                query_parts.append(f"WHERE {' AND '.join(where_clause)}")
             
             if group_by_clause:
-                query += f"\nGROUP BY {', '.join(group_by_clause)}"
+                query_parts.append(f"GROUP BY {', '.join(group_by_clause)}")
             
             if order_by_clause:
-                query += f"\nORDER BY {', '.join(order_by_clause)}"
+                query_parts.append(f"ORDER BY {', '.join(order_by_clause)}")
             
             if limit_clause:
-                query += f"\n{limit_clause}"
+                query_parts.append(limit_clause)
+            
+            query = "\n".join(query_parts)
             
             # 쿼리 및 메타데이터 반환
             return self.success_response({
@@ -1287,8 +1756,6 @@ class BigQueryTool(Tool):
 
 
 if __name__ == "__main__":
-    import asyncio
-    
     async def test_list_datasets():
         """Test function for the list datasets tool"""
         bq_tool = BigQueryTool()
@@ -1,26 +1,32 @@
 import asyncio
-import json
-import os
-import sys
+from pathlib import Path
 
-# 경로 추가 (현재 디렉토리를 import path에 추가)
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.append(parent_dir)
+import orjson
 
-from tool_integration_setup import setup_suna_tools
-from prompt_templates import PromptTemplates
+# GCP 서비스 계정 키 파일 경로 (backend/gcp-credentials, 필요한 경우 실제 경로로 변경하세요)
+CREDENTIALS_PATH = Path(__file__).resolve().parents[2] / "gcp-credentials" / "service-account-key.json"
+
+def print_json(result):
+    """결과 딕셔너리를 들여쓰기된 JSON으로 출력합니다."""
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode())
 
 async def test_integration():
+    # 도구 모듈은 실행할 때만 불러옴 (이 파일을 import해도 부작용 없음)
+    from tool_integration_setup import setup_suna_tools
+    from prompt_templates import PromptTemplates
+    
     # 도구 설정
     project_id = "your-gcp-project-id"  # 실제 프로젝트 ID로 변경하세요
     
-    # GCP 서비스 계정 키 파일 경로
-    # 필요한 경우 실제 경로로 변경하세요
-    credentials_path = os.path.join(os.path.dirname(parent_dir), "gcp-credentials", "service-account-key.json")
+    # 자격 증명 파일이 없으면 도구 초기화 전에 바로 중단
+    if not CREDENTIALS_PATH.is_file():
+        print(f"도구 설정 오류: 자격 증명 파일을 찾을 수 없습니다: {CREDENTIALS_PATH}")
+        return
     
-    # 도구 초기화
-    tools = setup_suna_tools(project_id, credentials_path)
+    # 도구 초기화 (블로킹 GCP 인증은 스레드에서 실행하고 그동안 여정 템플릿 준비)
+    tools_task = asyncio.create_task(asyncio.to_thread(setup_suna_tools, project_id, str(CREDENTIALS_PATH)))
+    journey_template = PromptTemplates.get_journey_template("https://example.com")
+    tools = await tools_task
     
     if not tools.get("success", False):
         print(f"도구 설정 오류: {tools.get('message')}")
@@ -34,19 +40,17 @@ async def test_integration():
     result = await tool_integration.handle_tool_call("explore_bigquery_dataset", {
         "dataset_id": "analytics_data"
     })
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print_json(result)
     
     # BigQuery 쿼리 제안 테스트
     print("\n=== BigQuery 쿼리 제안 ===")
     result = await tool_integration.handle_tool_call("get_bigquery_suggestions", {
         "intent": "일별 웹사이트 트래픽 추세 분석"
     })
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print_json(result)
     
     # 웹 여정 실행 테스트
     print("\n=== 웹 여정 실행 ===")
-    journey_template = PromptTemplates.get_journey_template("https://example.com")
-    
     result = await tool_integration.handle_tool_call("execute_web_journey", {
         "scenario": journey_template
     })
@@ -67,4 +71,11 @@ async def test_integration():
                 print(f"- {issue.get('severity', '').upper()}: {issue.get('title')} - {issue.get('description')}")
 
 if __name__ == "__main__":
+    # uvloop이 설치되어 있으면 libuv 기반 이벤트 루프 사용 (브라우저/BigQuery I/O 대기 비용 감소)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(test_integration())
\ No newline at end of file
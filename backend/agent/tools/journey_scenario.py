@@ -1,21 +1,98 @@
+import os
 import json
+import time
+import shutil
+import tempfile
 import asyncio
 import datetime
 import base64
 from typing import Dict, List, Any, Optional
 from urllib.parse import urlparse
 
+import orjson
+
+# 이벤트 기반 대기 폴링 간격 및 기본 타임아웃
+_READY_POLL_INTERVAL = 0.05
+_SELECTOR_READY_TIMEOUT_MS = 1500
+_PAGE_IDLE_TIMEOUT_MS = 5000
+
+# 여정 경로에 URL을 남기는 단계 유형
+_PATH_STEP_TYPES = frozenset({"navigate", "login", "navigate_to_mypage"})
+
+# journey_data["steps"]에 남기는 단계 요약 필드 (전체 단계 기록은 저널 파일에 저장)
+_STEP_SUMMARY_KEYS = ("type", "success", "message", "url", "selector", "duration_seconds")
+
+# 저널 파일에 평문으로 남기지 않는 단계 필드 (입력 텍스트, 비밀번호)
+_JOURNAL_REDACTED_KEYS = ("text", "password")
+
+# 요소가 배치될 때까지 기다린 뒤 화면 중앙으로 스크롤하는 공통 JS (click/input 스크립트에서 사용)
+_LOCATE_ELEMENT_JS = """
+        const deadline = performance.now() + timeoutMs;
+        let element = document.querySelector(selector);
+        while ((!element || element.getBoundingClientRect().height === 0) && performance.now() < deadline) {
+            await new Promise(resolve => setTimeout(resolve, 50));
+            element = document.querySelector(selector);
+        }
+        if (!element) return { success: false, message: "요소를 찾을 수 없음" };
+    
+        if (scrollIntoView) {
+            element.scrollIntoView({ block: 'center' });
+            await new Promise(resolve => requestAnimationFrame(resolve));
+        }
+"""
+
+# 단계별 JS 함수 (인자는 _js_call에서 JSON으로 인코딩하여 전달)
+_CLICK_JS = """async (selector, scrollIntoView, timeoutMs) => {
+    try {""" + _LOCATE_ELEMENT_JS + """
+        element.click();
+        return { success: true, message: "요소 클릭 성공" };
+    } catch (error) {
+        return { success: false, message: error.toString() };
+    }
+}"""
+
+_INPUT_JS = """async (selector, text, scrollIntoView, timeoutMs) => {
+    try {""" + _LOCATE_ELEMENT_JS + """
+        // 기존 내용 지우기
+        element.value = "";
+        
+        // 새 내용 입력
+        element.value = text;
+        
+        // 입력 이벤트 발생
+        element.dispatchEvent(new Event('input', { bubbles: true }));
+        element.dispatchEvent(new Event('change', { bubbles: true }));
+        
+        return { success: true, message: "텍스트 입력 성공" };
+    } catch (error) {
+        return { success: false, message: error.toString() };
+    }
+}"""
+
+_PAGE_IDLE_JS = "() => ({ ready: document.readyState === 'complete' })"
+
+
+def _js_call(function_js: str, *args: Any) -> str:
+    """
+    고정된 JS 함수에 JSON으로 인코딩한 인자를 넘겨 호출하는 스크립트를 만듭니다.
+    """
+    return f"() => ({function_js})({', '.join(json.dumps(arg) for arg in args)})"
+
 class JourneyScenario:
-    def __init__(self, browser_tool, analytics_integrator=None):
+    def __init__(self, browser_tool, analytics_integrator=None, screenshot_dir: Optional[str] = None):
         """
         웹 자동화 시나리오 클래스 초기화
         
         Args:
             browser_tool: SandboxBrowserTool 인스턴스
             analytics_integrator (optional): AnalyticsIntegrator 인스턴스
+            screenshot_dir (str, optional): 스크린샷 저장 디렉토리 (기본값: 첫 스크린샷 시 생성하는 임시 디렉토리)
         """
         self.browser_tool = browser_tool
         self.analytics_integrator = analytics_integrator
+        self.screenshot_dir = screenshot_dir
+        # screenshot_dir를 지정하지 않아 직접 만든 임시 디렉토리 (close에서 삭제)
+        self._owned_screenshot_dir: Optional[str] = None
         self.journey_data = {
             "start_time": datetime.datetime.now().isoformat(),
             "steps": [],
@@ -26,6 +103,102 @@ class JourneyScenario:
             "a11y_results": {},
             "screenshots": []
         }
+        # 여정 경로에 포함되는 URL 목록 (단계 실행 시 누적)
+        self._path_urls: List[str] = []
+        # 첫 번째 navigate/login 단계의 페이지 경로 (analyze_journey 기본값)
+        self._first_page_path: Optional[str] = None
+        # 단계별 전체 기록을 JSONL로 저장하는 저널 파일
+        fd, self._journal_path = tempfile.mkstemp(prefix="journey_", suffix=".jsonl")
+        os.close(fd)
+        self._journal_fh = None
+        # 실행 중인 execute_scenario 호출 수 (풀에서 실행 중인 시나리오를 정리하지 않도록)
+        self._active_runs = 0
+    
+    @property
+    def is_running(self) -> bool:
+        """
+        execute_scenario가 실행 중인지 여부
+        """
+        return self._active_runs > 0
+    
+    def _write_journal(self, step_data: Dict[str, Any]) -> None:
+        """
+        단계 기록을 저널 파일에 한 줄로 추가합니다. (입력 텍스트/비밀번호는 가려서 기록, 블로킹)
+        """
+        if self._journal_fh is None:
+            self._journal_fh = open(self._journal_path, "ab")
+        redacted = {key: "***" for key in _JOURNAL_REDACTED_KEYS if step_data.get(key)}
+        if redacted:
+            step_data = {**step_data, **redacted}
+        self._journal_fh.write(orjson.dumps(step_data, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+    
+    def _reset_journal(self) -> None:
+        """
+        저널 파일을 비우고 새로 엽니다.
+        """
+        if self._journal_fh is not None:
+            self._journal_fh.close()
+        self._journal_fh = open(self._journal_path, "wb")
+    
+    def close(self) -> None:
+        """
+        저널 파일을 닫고 삭제합니다. (직접 만든 스크린샷 임시 디렉토리도 함께 삭제)
+        """
+        if self._journal_fh is not None:
+            self._journal_fh.close()
+            self._journal_fh = None
+        try:
+            os.unlink(self._journal_path)
+        except FileNotFoundError:
+            pass
+        if self._owned_screenshot_dir is not None:
+            shutil.rmtree(self._owned_screenshot_dir, ignore_errors=True)
+            self.screenshot_dir = self._owned_screenshot_dir = None
+    
+    @staticmethod
+    def _write_screenshot(directory: str, screenshot_id: int, data: str) -> str:
+        """
+        base64 스크린샷을 PNG 파일로 저장하고 경로를 반환합니다.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{screenshot_id}.png")
+        with open(path, "wb") as f:
+            f.write(base64.b64decode(data))
+        return path
+    
+    async def _wait_for_page_idle(self, timeout_ms: int = _PAGE_IDLE_TIMEOUT_MS) -> bool:
+        """
+        document.readyState가 complete가 될 때까지 짧은 간격으로 폴링합니다.
+        
+        click/input 단계와 같은 browser_evaluate 경로로 평가하며, 브라우저 도구가
+        browser_evaluate를 제공하지 않으면 대기하지 않고 바로 반환합니다.
+        
+        Args:
+            timeout_ms (int): 최대 대기 시간(밀리초)
+            
+        Returns:
+            bool: 타임아웃 전에 로드가 완료되었는지 여부
+        """
+        evaluate = getattr(self.browser_tool, "browser_evaluate", None)
+        if evaluate is None:
+            return False
+        
+        script = _js_call(_PAGE_IDLE_JS)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        
+        while True:
+            try:
+                result = await evaluate(script)
+                if isinstance(result, dict) and result.get("ready", False):
+                    return True
+            except Exception:
+                # 내비게이션 중 실행 컨텍스트가 교체되면 평가가 실패할 수 있으므로 다음 폴링에서 재시도
+                pass
+            
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(_READY_POLL_INTERVAL)
     
     async def execute_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -37,9 +210,10 @@ class JourneyScenario:
         Returns:
             Dict: 단계 실행 결과
         """
-        step_start_time = datetime.datetime.now()
+        # 소요 시간은 perf_counter로 측정하고, 벽시계 시각은 기록용으로만 생성
+        step_start = time.perf_counter()
         step_type = step.get("action")
-        step_data = {"type": step_type, "start_time": step_start_time.isoformat()}
+        step_data = {"type": step_type, "start_time": datetime.datetime.now().isoformat()}
         
         try:
             # 단계 유형에 따른 처리
@@ -56,30 +230,10 @@ class JourneyScenario:
                 selector = step.get("selector")
                 element_desc = step.get("description", "요소")
                 
-                # 먼저 요소가 보이도록 스크롤
-                if step.get("scroll_into_view", True):
-                    await self.browser_tool.browser_evaluate(f"""
-                        () => {{
-                            const element = document.querySelector("{selector}");
-                            if (element) element.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-                        }}
-                    """)
-                    await asyncio.sleep(1)
-                
-                # 요소 클릭
-                result = await self.browser_tool.browser_evaluate(f"""
-                    async () => {{
-                        try {{
-                            const element = document.querySelector("{selector}");
-                            if (!element) return {{ success: false, message: "요소를 찾을 수 없음" }};
-                            
-                            element.click();
-                            return {{ success: true, message: "요소 클릭 성공" }};
-                        }} catch (error) {{
-                            return {{ success: false, message: error.toString() }};
-                        }}
-                    }}
-                """)
+                # 요소 대기, 스크롤, 클릭을 한 번의 evaluate 호출로 처리
+                result = await self.browser_tool.browser_evaluate(_js_call(
+                    _CLICK_JS, selector, step.get("scroll_into_view", True), _SELECTOR_READY_TIMEOUT_MS
+                ))
                 
                 step_data.update({
                     "selector": selector,
@@ -93,39 +247,10 @@ class JourneyScenario:
                 text = step.get("text", "")
                 element_desc = step.get("description", "입력 필드")
                 
-                # 요소가 보이도록 스크롤
-                if step.get("scroll_into_view", True):
-                    await self.browser_tool.browser_evaluate(f"""
-                        () => {{
-                            const element = document.querySelector("{selector}");
-                            if (element) element.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-                        }}
-                    """)
-                    await asyncio.sleep(1)
-                
-                # 텍스트 입력
-                result = await self.browser_tool.browser_evaluate(f"""
-                    async () => {{
-                        try {{
-                            const element = document.querySelector("{selector}");
-                            if (!element) return {{ success: false, message: "요소를 찾을 수 없음" }};
-                            
-                            // 기존 내용 지우기
-                            element.value = "";
-                            
-                            // 새 내용 입력
-                            element.value = "{text}";
-                            
-                            // 입력 이벤트 발생
-                            element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                            element.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                            
-                            return {{ success: true, message: "텍스트 입력 성공" }};
-                        }} catch (error) {{
-                            return {{ success: false, message: error.toString() }};
-                        }}
-                    }}
-                """)
+                # 요소 대기, 스크롤, 텍스트 입력을 한 번의 evaluate 호출로 처리
+                result = await self.browser_tool.browser_evaluate(_js_call(
+                    _INPUT_JS, selector, text, step.get("scroll_into_view", True), _SELECTOR_READY_TIMEOUT_MS
+                ))
                 
                 step_data.update({
                     "selector": selector,
@@ -172,17 +297,30 @@ class JourneyScenario:
                 })
                 
                 if result.get("success", False) and result.get("data"):
+                    # 이미지 데이터는 메모리에 두지 않고 파일로 저장한 뒤 경로만 기록
+                    if self.screenshot_dir is None:
+                        self.screenshot_dir = self._owned_screenshot_dir = tempfile.mkdtemp(prefix="journey_screenshots_")
+                    path = await asyncio.to_thread(
+                        self._write_screenshot, self.screenshot_dir, screenshot_id, result["data"]
+                    )
                     self.journey_data["screenshots"].append({
                         "id": screenshot_id,
-                        "data": result["data"],
-                        "timestamp": datetime.datetime.now().isoformat(),
+                        "path": path,
+                        "timestamp": step_data["start_time"],
                         "dimensions": result.get("dimensions", {})
                     })
             
             elif step_type == "analyze_page":
-                structure_result = await self.browser_tool.browser_analyze_page_structure()
-                metrics_result = await self.browser_tool.browser_extract_ui_metrics()
-                a11y_result = await self.browser_tool.browser_run_a11y_audit()
+                # 서로 독립적인 세 가지 분석을 동시에 실행 (실패한 분석은 실패 결과로 변환)
+                structure_result, metrics_result, a11y_result = [
+                    {"success": False, "message": str(result)} if isinstance(result, Exception) else result
+                    for result in await asyncio.gather(
+                        self.browser_tool.browser_analyze_page_structure(),
+                        self.browser_tool.browser_extract_ui_metrics(),
+                        self.browser_tool.browser_run_a11y_audit(),
+                        return_exceptions=True
+                    )
+                ]
                 
                 step_data.update({
                     "page_structure": structure_result.get("structure", {}),
@@ -252,11 +390,11 @@ class JourneyScenario:
             })
         
         # 단계 종료 시간 및 소요 시간 계산
-        step_end_time = datetime.datetime.now()
-        step_duration = (step_end_time - step_start_time).total_seconds()
+        step_duration = time.perf_counter() - step_start
+        step_end_time = datetime.datetime.now().isoformat()
         
         step_data.update({
-            "end_time": step_end_time.isoformat(),
+            "end_time": step_end_time,
             "duration_seconds": step_duration
         })
         
@@ -267,11 +405,20 @@ class JourneyScenario:
                 "step_index": len(self.journey_data["steps"]),
                 "message": step_data.get("message", ""),
                 "element": step_data.get("selector", step_data.get("url", "")),
-                "timestamp": step_end_time.isoformat()
+                "timestamp": step_end_time
             })
         
-        # 여정 단계 목록에 추가
-        self.journey_data["steps"].append(step_data)
+        # 전체 기록은 저널 파일에 저장하고, 여정 단계 목록에는 요약만 보관
+        # (analyze_page 기록은 페이지 구조/메트릭 전체를 담으므로 직렬화와 쓰기를 스레드에서 수행)
+        await asyncio.to_thread(self._write_journal, step_data)
+        self.journey_data["steps"].append(
+            {key: step_data[key] for key in _STEP_SUMMARY_KEYS if key in step_data}
+        )
+        if step_type in _PATH_STEP_TYPES and "url" in step_data:
+            url = step_data["url"]
+            self._path_urls.append(url)
+            if self._first_page_path is None and step_type != "navigate_to_mypage" and isinstance(url, str):
+                self._first_page_path = urlparse(url).path
         
         return step_data
     
@@ -285,11 +432,24 @@ class JourneyScenario:
         Returns:
             Dict: 시나리오 실행 결과
         """
+        self._active_runs += 1
+        try:
+            return await self._run_scenario(scenario)
+        finally:
+            self._active_runs -= 1
+    
+    async def _run_scenario(self, scenario: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        execute_scenario의 실제 실행 부분
+        """
         # 시작 시간 기록
-        scenario_start_time = datetime.datetime.now()
-        self.journey_data["start_time"] = scenario_start_time.isoformat()
+        scenario_start = time.perf_counter()
+        self.journey_data["start_time"] = datetime.datetime.now().isoformat()
         self.journey_data["steps"] = []
         self.journey_data["errors"] = []
+        self._path_urls = []
+        self._first_page_path = None
+        await asyncio.to_thread(self._reset_journal)
         
         # 각 단계 순차적으로 실행
         for i, step in enumerate(scenario):
@@ -303,18 +463,23 @@ class JourneyScenario:
                 print(f"중요 단계 실패로 시나리오 중단: {step_result.get('message', '')}")
                 break
             
-            # 다음 단계 실행 전 잠시 대기 (페이지 안정화를 위해)
-            await asyncio.sleep(step.get("post_delay", 1))
+            # 다음 단계 실행 전 대기 (post_delay를 지정하면 고정 시간, 아니면 페이지 로드 완료까지)
+            post_delay = step.get("post_delay")
+            if post_delay is not None:
+                await asyncio.sleep(post_delay)
+            else:
+                await self._wait_for_page_idle()
         
         # 종료 시간 및 총 소요 시간 계산
-        scenario_end_time = datetime.datetime.now()
-        duration_seconds = (scenario_end_time - scenario_start_time).total_seconds()
+        duration_seconds = time.perf_counter() - scenario_start
+        await asyncio.to_thread(self._journal_fh.flush)
         
         self.journey_data.update({
-            "end_time": scenario_end_time.isoformat(),
+            "end_time": datetime.datetime.now().isoformat(),
             "duration": duration_seconds,
             "success": len(self.journey_data["errors"]) == 0,
-            "path": self._extract_journey_path()
+            "path": self._extract_journey_path(),
+            "journal_path": self._journal_path
         })
         
         # 결과 반환
@@ -331,15 +496,7 @@ class JourneyScenario:
         Returns:
             str: 여정 경로 문자열
         """
-        urls = []
-        
-        for step in self.journey_data["steps"]:
-            if step["type"] in ["navigate", "login"] and "url" in step:
-                urls.append(step["url"])
-            elif step["type"] == "navigate_to_mypage" and "url" in step:
-                urls.append(step["url"])
-        
-        return " -> ".join(urls)
+        return " -> ".join(self._path_urls)
     
     async def analyze_journey(self, page_path: str = None) -> Dict[str, Any]:
         """
@@ -358,15 +515,8 @@ class JourneyScenario:
             }
         
         # 페이지 경로가 지정되지 않은 경우 여정의 첫 번째 URL에서 추출
-        if not page_path and self.journey_data["steps"]:
-            for step in self.journey_data["steps"]:
-                if step["type"] in ["navigate", "login"] and "url" in step:
-                    try:
-                        parsed_url = urlparse(step["url"])
-                        page_path = parsed_url.path
-                        break
-                    except:
-                        pass
+        if not page_path:
+            page_path = self._first_page_path
         
         if not page_path:
             return {
@@ -1,8 +1,146 @@
 import os
 import json
+import copy
+import time
 import asyncio
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Callable
 
+from analytics_integrator import AnalyticsIntegrator
+from journey_scenario import JourneyScenario
+
+# 세션별로 유지하는 JourneyScenario 최대 개수
+_SCENARIO_POOL_MAX_SIZE = 16
+
+# LLM에 등록하는 도구 스키마 (임포트 시 한 번만 생성)
+_TOOL_SCHEMAS = (
+    # BigQuery 도구
+    {
+        "type": "function",
+        "function": {
+            "name": "run_bigquery",
+            "description": "BigQuery에서 SQL 쿼리를 실행하여 데이터를 분석합니다. 웹 분석, 제품 데이터, 사용자 행동 등에 관한 데이터를 조회할 때 사용하세요.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "실행할 SQL 쿼리. 쿼리는 BigQuery 문법을 따라야 합니다."
+                    },
+                    "params": {
+                        "type": "object",
+                        "description": "쿼리 매개변수 (선택적). 키-값 쌍으로 구성됩니다.",
+                        "additionalProperties": True
+                    }
+                },
+                "required": ["query"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "explore_bigquery_dataset",
+            "description": "BigQuery 데이터셋의 테이블 및 스키마 정보를 탐색합니다. 사용 가능한 데이터와 테이블 구조를 파악할 때 사용하세요.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "dataset_id": {
+                        "type": "string",
+                        "description": "탐색할 데이터셋 ID (예: 'analytics_data')"
+                    },
+                    "max_tables": {
+                        "type": "integer",
+                        "description": "반환할 최대 테이블 수 (기본값: 100)",
+                        "default": 100
+                    }
+                },
+                "required": ["dataset_id"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_bigquery_suggestions",
+            "description": "사용자 의도에 기반한 BigQuery 쿼리 제안을 생성합니다. 분석 방향이 명확하지 않을 때 적절한 쿼리 예시를 얻기 위해 사용하세요.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "intent": {
+                        "type": "string",
+                        "description": "사용자의 분석 의도 설명 (예: '일별 웹사이트 트래픽 추세 분석')"
+                    }
+                },
+                "required": ["intent"]
+            }
+        }
+    },
+    # 웹 자동화 시나리오 도구
+    {
+        "type": "function",
+        "function": {
+            "name": "execute_web_journey",
+            "description": "웹사이트 사용자 여정을 자동화하여 실행합니다. 로그인, 탐색, 페이지 분석 등의 단계로 구성된 시나리오를 실행하여 사용자 경험을 테스트합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "scenario": {
+                        "type": "array",
+                        "description": "실행할 시나리오 단계 목록",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "action": {
+                                    "type": "string",
+                                    "description": "수행할 동작 유형",
+                                    "enum": ["navigate", "click", "input", "wait", "scroll", "take_screenshot", "analyze_page", "login", "navigate_to_mypage"]
+                                },
+                                "critical": {
+                                    "type": "boolean",
+                                    "description": "이 단계가 실패하면 시나리오를 중단할지 여부",
+                                    "default": False
+                                },
+                                "post_delay": {
+                                    "type": "number",
+                                    "description": "이 단계 완료 후 고정 대기 시간(초). 지정하지 않으면 페이지 로드 완료까지 대기합니다."
+                                }
+                            },
+                            "required": ["action"],
+                            "additionalProperties": True
+                        }
+                    },
+                    "session_id": {
+                        "type": "string",
+                        "description": "여정을 구분할 세션 ID (선택적). 같은 세션 ID로 실행한 여정을 분석합니다."
+                    }
+                },
+                "required": ["scenario"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "analyze_web_journey",
+            "description": "실행된 웹 사용자 여정을 분석하고 UX/UI 개선 인사이트를 생성합니다. 여정을 먼저 execute_web_journey로 실행한 후 사용하세요.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "page_path": {
+                        "type": "string",
+                        "description": "분석할 페이지 경로 (예: '/products'). 지정하지 않으면 여정의 첫 번째 URL에서 추출합니다."
+                    },
+                    "session_id": {
+                        "type": "string",
+                        "description": "여정을 구분할 세션 ID (선택적). 같은 세션 ID로 실행한 여정을 분석합니다."
+                    }
+                }
+            }
+        }
+    },
+)
+
 class LLMToolIntegration:
     def __init__(self, sandbox_browser_tool, bigquery_tool):
         """
@@ -14,7 +152,49 @@ class LLMToolIntegration:
         """
         self.browser_tool = sandbox_browser_tool
         self.bigquery_tool = bigquery_tool
-        self.journey_scenario = None
+        # 세션 ID별 JourneyScenario (LRU 순서, 최대 _SCENARIO_POOL_MAX_SIZE개)
+        self._scenario_pool: "OrderedDict[str, JourneyScenario]" = OrderedDict()
+        self._analytics_integrator = None
+        
+        # 탐색/쿼리 제안 결과 캐시 (키: 호출 매개변수, 값: (저장 시각, 결과))
+        self._explore_cache: Dict[tuple, tuple] = {}
+        self._suggest_cache: Dict[tuple, tuple] = {}
+        self._cache_ttl = 300
+        self._cache_max_entries = 1024
+        
+        # 도구 이름 → 처리 메서드
+        self._dispatch: Dict[str, Callable] = {
+            "run_bigquery": self._handle_run_bigquery,
+            "explore_bigquery_dataset": self._handle_explore,
+            "get_bigquery_suggestions": self._handle_suggest,
+            "execute_web_journey": self._handle_execute_journey,
+            "analyze_web_journey": self._handle_analyze_journey,
+        }
+    
+    def flush_cache(self):
+        """
+        BigQuery 탐색 및 쿼리 제안 캐시를 비웁니다.
+        """
+        self._explore_cache.clear()
+        self._suggest_cache.clear()
+    
+    async def _cached_call(self, cache: Dict[tuple, tuple], key: tuple, loader: Callable) -> Dict[str, Any]:
+        """
+        TTL 이내의 동일한 호출은 캐시된 결과를 반환하고, 아니면 loader를 호출해 성공한 결과만 저장합니다.
+        """
+        cached = cache.get(key)
+        if cached and time.monotonic() - cached[0] < self._cache_ttl:
+            # 최근 사용 항목을 뒤로 옮겨 LRU 순서 유지
+            cache[key] = cache.pop(key)
+            return copy.deepcopy(cached[1])
+        
+        result = await loader()
+        if isinstance(result, dict) and result.get("success", False):
+            cache.pop(key, None)
+            if len(cache) >= self._cache_max_entries:
+                cache.pop(next(iter(cache)))
+            cache[key] = (time.monotonic(), copy.deepcopy(result))
+        return result
     
     def register_tools_with_llm(self, tool_registry_function: Callable):
         """
@@ -23,128 +203,8 @@ class LLMToolIntegration:
         Args:
             tool_registry_function: 도구를 등록하는 콜백 함수
         """
-        # BigQuery 도구 등록
-        tool_registry_function({
-            "type": "function",
-            "function": {
-                "name": "run_bigquery",
-                "description": "BigQuery에서 SQL 쿼리를 실행하여 데이터를 분석합니다. 웹 분석, 제품 데이터, 사용자 행동 등에 관한 데이터를 조회할 때 사용하세요.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "실행할 SQL 쿼리. 쿼리는 BigQuery 문법을 따라야 합니다."
-                        },
-                        "params": {
-                            "type": "object",
-                            "description": "쿼리 매개변수 (선택적). 키-값 쌍으로 구성됩니다.",
-                            "additionalProperties": True
-                        }
-                    },
-                    "required": ["query"]
-                }
-            }
-        })
-        
-        tool_registry_function({
-            "type": "function",
-            "function": {
-                "name": "explore_bigquery_dataset",
-                "description": "BigQuery 데이터셋의 테이블 및 스키마 정보를 탐색합니다. 사용 가능한 데이터와 테이블 구조를 파악할 때 사용하세요.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "dataset_id": {
-                            "type": "string",
-                            "description": "탐색할 데이터셋 ID (예: 'analytics_data')"
-                        },
-                        "max_tables": {
-                            "type": "integer",
-                            "description": "반환할 최대 테이블 수 (기본값: 100)",
-                            "default": 100
-                        }
-                    },
-                    "required": ["dataset_id"]
-                }
-            }
-        })
-        
-        tool_registry_function({
-            "type": "function",
-            "function": {
-                "name": "get_bigquery_suggestions",
-                "description": "사용자 의도에 기반한 BigQuery 쿼리 제안을 생성합니다. 분석 방향이 명확하지 않을 때 적절한 쿼리 예시를 얻기 위해 사용하세요.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "intent": {
-                            "type": "string",
-                            "description": "사용자의 분석 의도 설명 (예: '일별 웹사이트 트래픽 추세 분석')"
-                        }
-                    },
-                    "required": ["intent"]
-                }
-            }
-        })
-        
-        # 웹 자동화 시나리오 도구 등록
-        tool_registry_function({
-            "type": "function",
-            "function": {
-                "name": "execute_web_journey",
-                "description": "웹사이트 사용자 여정을 자동화하여 실행합니다. 로그인, 탐색, 페이지 분석 등의 단계로 구성된 시나리오를 실행하여 사용자 경험을 테스트합니다.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "scenario": {
-                            "type": "array",
-                            "description": "실행할 시나리오 단계 목록",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "action": {
-                                        "type": "string",
-                                        "description": "수행할 동작 유형",
-                                        "enum": ["navigate", "click", "input", "wait", "scroll", "take_screenshot", "analyze_page", "login", "navigate_to_mypage"]
-                                    },
-                                    "critical": {
-                                        "type": "boolean",
-                                        "description": "이 단계가 실패하면 시나리오를 중단할지 여부",
-                                        "default": False
-                                    },
-                                    "post_delay": {
-                                        "type": "number",
-                                        "description": "이 단계 완료 후 대기 시간(초)",
-                                        "default": 1
-                                    }
-                                },
-                                "required": ["action"],
-                                "additionalProperties": True
-                            }
-                        }
-                    },
-                    "required": ["scenario"]
-                }
-            }
-        })
-        
-        tool_registry_function({
-            "type": "function",
-            "function": {
-                "name": "analyze_web_journey",
-                "description": "실행된 웹 사용자 여정을 분석하고 UX/UI 개선 인사이트를 생성합니다. 여정을 먼저 execute_web_journey로 실행한 후 사용하세요.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "page_path": {
-                            "type": "string",
-                            "description": "분석할 페이지 경로 (예: '/products'). 지정하지 않으면 여정의 첫 번째 URL에서 추출합니다."
-                        }
-                    }
-                }
-            }
-        })
+        for schema in _TOOL_SCHEMAS:
+            tool_registry_function(schema)
     
     async def handle_tool_call(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -157,56 +217,107 @@ class LLMToolIntegration:
         Returns:
             Dict: 도구 호출 결과
         """
+        handler = self._dispatch.get(tool_name)
+        if handler is None:
+            return {
+                "success": False,
+                "message": f"알 수 없는 도구 이름: {tool_name}"
+            }
+        
         try:
-            # BigQuery 도구 호출 처리
-            if tool_name == "run_bigquery":
-                query = params.get("query", "")
-                query_params = params.get("params", {})
-                
-                return await self.bigquery_tool.run_query(query, query_params)
-            
-            elif tool_name == "explore_bigquery_dataset":
-                dataset_id = params.get("dataset_id", "")
-                max_tables = params.get("max_tables", 100)
-                
-                return await self.bigquery_tool.explore_dataset(dataset_id, max_tables)
-            
-            elif tool_name == "get_bigquery_suggestions":
-                intent = params.get("intent", "")
-                
-                return await self.bigquery_tool.get_query_suggestions(intent)
-            
-            # 웹 자동화 시나리오 도구 호출 처리
-            elif tool_name == "execute_web_journey":
-                scenario = params.get("scenario", [])
-                
-                if not self.journey_scenario:
-                    from analytics_integrator import AnalyticsIntegrator
-                    analytics_integrator = AnalyticsIntegrator(self.bigquery_tool.project_id)
-                    from journey_scenario import JourneyScenario
-                    self.journey_scenario = JourneyScenario(self.browser_tool, analytics_integrator)
-                
-                return await self.journey_scenario.execute_scenario(scenario)
-            
-            elif tool_name == "analyze_web_journey":
-                page_path = params.get("page_path")
-                
-                if not self.journey_scenario:
-                    return {
-                        "success": False,
-                        "message": "먼저 execute_web_journey를 호출하여 여정을 실행해야 합니다."
-                    }
-                
-                return await self.journey_scenario.analyze_journey(page_path)
-            
-            else:
-                return {
-                    "success": False,
-                    "message": f"알 수 없는 도구 이름: {tool_name}"
-                }
-                
+            return await handler(params)
         except Exception as e:
             return {
                 "success": False,
                 "message": f"도구 호출 오류: {str(e)}"
-            }
\ No newline at end of file
+            }
+    
+    # BigQuery 도구 호출 처리
+    async def _handle_run_bigquery(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        query = params.get("query", "")
+        query_params = params.get("params", {})
+        
+        return await self.bigquery_tool.run_query(query, query_params)
+    
+    async def _handle_explore(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        dataset_id = params.get("dataset_id", "")
+        max_tables = params.get("max_tables", 100)
+        
+        return await self._cached_call(
+            self._explore_cache,
+            (dataset_id, max_tables),
+            lambda: self.bigquery_tool.explore_dataset(dataset_id, max_tables)
+        )
+    
+    async def _handle_suggest(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        intent = params.get("intent", "")
+        
+        return await self._cached_call(
+            self._suggest_cache,
+            (intent,),
+            lambda: self.bigquery_tool.get_query_suggestions(intent)
+        )
+    
+    # 웹 자동화 시나리오 도구 호출 처리
+    def _get_journey_scenario(self, session_id: str) -> JourneyScenario:
+        """
+        세션의 JourneyScenario를 반환합니다. 없으면 생성하고, 풀이 가득 차면 가장 오래 쓰지 않은 세션을 정리합니다.
+        """
+        scenario = self._scenario_pool.get(session_id)
+        if scenario is not None:
+            self._scenario_pool.move_to_end(session_id)
+            return scenario
+        
+        if self._analytics_integrator is None:
+            self._analytics_integrator = AnalyticsIntegrator(self.bigquery_tool.project_id)
+        
+        scenario = JourneyScenario(self.browser_tool, self._analytics_integrator)
+        self._scenario_pool[session_id] = scenario
+        self._evict_idle_scenarios(keep=session_id)
+        return scenario
+    
+    def _evict_idle_scenarios(self, keep: str):
+        """
+        풀이 최대 크기를 넘으면 실행 중이 아닌 세션을 오래된 순서로 정리합니다. (keep 세션은 제외)
+        
+        실행 중인 시나리오는 저널/스크린샷 파일을 계속 쓰므로 정리하지 않고 남겨 두며,
+        모두 실행 중이면 다음 정리 시점까지 풀이 최대 크기를 잠시 넘을 수 있습니다.
+        """
+        excess = len(self._scenario_pool) - _SCENARIO_POOL_MAX_SIZE
+        if excess <= 0:
+            return
+        
+        idle_sessions = [
+            session_id for session_id, scenario in self._scenario_pool.items()
+            if session_id != keep and not scenario.is_running
+        ][:excess]
+        for session_id in idle_sessions:
+            self._scenario_pool.pop(session_id).close()
+    
+    def close(self):
+        """
+        풀에 있는 모든 JourneyScenario의 저널 파일과 임시 스크린샷 디렉토리를 정리합니다.
+        """
+        while self._scenario_pool:
+            _, scenario = self._scenario_pool.popitem(last=False)
+            scenario.close()
+    
+    async def _handle_execute_journey(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        scenario = params.get("scenario", [])
+        session_id = params.get("session_id", "default")
+        
+        return await self._get_journey_scenario(session_id).execute_scenario(scenario)
+    
+    async def _handle_analyze_journey(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        page_path = params.get("page_path")
+        session_id = params.get("session_id", "default")
+        
+        journey_scenario = self._scenario_pool.get(session_id)
+        if journey_scenario is None:
+            return {
+                "success": False,
+                "message": "먼저 execute_web_journey를 호출하여 여정을 실행해야 합니다."
+            }
+        
+        self._scenario_pool.move_to_end(session_id)
+        return await journey_scenario.analyze_journey(page_path)
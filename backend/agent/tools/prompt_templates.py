@@ -1,10 +1,5 @@
-class PromptTemplates:
-    @staticmethod
-    def get_system_message():
-        """
-        LLM 시스템 메시지 템플릿을 반환합니다.
-        """
-        return """
+# LLM 시스템 메시지 (호출마다 다시 만들지 않도록 모듈 상수로 유지)
+_SYSTEM_MESSAGE = """
         당신은 웹 분석 및 UX/UI 개선 전문가 AI 어시스턴트입니다. 당신은 사용자의 웹사이트에서 고객 경험을 향상시키기 위한 분석과 개선 제안을 제공합니다.
 
         당신은 다음 도구를 사용할 수 있습니다:
@@ -27,6 +22,14 @@ class PromptTemplates:
 
         사용자의 질문에 직접적으로 답하고, 필요한 경우 추가 정보를 요청하세요.
         """
+
+class PromptTemplates:
+    @staticmethod
+    def get_system_message():
+        """
+        LLM 시스템 메시지 템플릿을 반환합니다.
+        """
+        return _SYSTEM_MESSAGE
     
     @staticmethod
     def get_journey_template(url: str, credentials = None):
@@ -1,8 +1,16 @@
 import os
+import re
 import json
-import base64
+import asyncio
+import hashlib
+import time
 import traceback
-from datetime import datetime
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
 
 from agentpress.tool import ToolResult, openapi_schema, xml_schema
 from agentpress.thread_manager import ThreadManager
@@ -10,6 +18,213 @@ from sandbox.sandbox import SandboxToolsBase, Sandbox
 from utils.logger import logger
 from agent.tools.sb_browser_tool import SandboxBrowserTool
 
+def _dumps(data) -> bytes:
+    """JSON 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+def _loads(data: bytes):
+    """JSON 역직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """
+    버퍼링 없이 파일에 바이트를 원자적으로 기록합니다. (쿠키 파일이므로 소유자만 읽기/쓰기 가능)
+    
+    임시 파일에 모두 쓴 뒤 os.replace로 교체하므로, 저장 중 중단되어도 기존 파일이 깨지지 않습니다.
+    """
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _read_bytes(path: str) -> bytes:
+    """파일 크기만큼 한 번에 읽습니다."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 1))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+# 일반적인 데스크탑 브라우저 UA
+_DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+
+# 헤드리스 여부별 기본 브라우저 설정 (읽기 전용으로 사용, 사용자 UA 지정 시에만 복사)
+_BASE_BROWSER_CONFIGS = {
+    True: {"headless": True, "userAgent": _DEFAULT_USER_AGENT},
+    False: {"headless": False, "userAgent": _DEFAULT_USER_AGENT},
+}
+
+# OCR 결과 캐시 최대 항목 수 (키: 요소 이미지 해시)
+_OCR_CACHE_MAX_ENTRIES = 256
+
+# 로그인/CAPTCHA 탐지에 사용하는 선택자와 키워드
+_USERNAME_SELECTOR = 'input[type="email"], input[type="text"][name*="user"], input[type="text"][name*="email"], input[type="text"][id*="user"], input[type="text"][id*="email"]'
+_USERNAME_CHECK_SELECTOR = 'input[type="email"], input[type="text"][name*="user"], input[type="text"][name*="email"]'
+_PASSWORD_SELECTOR = 'input[type="password"]'
+_LOGIN_FORM_SELECTOR = 'form[action*="login"], form[id*="login"], form[class*="login"]'
+_SUBMIT_SELECTOR = 'button[type="submit"], input[type="submit"], button[name*="login"], button[id*="login"], button.login, a.login-button, a[href*="login"]'
+_BUTTON_SELECTOR = 'button, input[type="button"], a.btn, a.button, [role="button"]'
+# 쿠키 동의 후보 (일반 링크 "Cookie policy" 등을 누르지 않도록 버튼 역할 요소만 사용)
+_CONSENT_BUTTON_SELECTOR = 'button, input[type="button"], [role="button"]'
+_CAPTCHA_SELECTOR = 'iframe[src*="recaptcha"], iframe[src*="captcha"], img[alt*="captcha"], div.captcha, div[class*="captcha"]'
+_CAPTCHA_IMAGE_SELECTOR = 'img[alt*="captcha"], img[src*="captcha"], iframe[src*="captcha"]'
+_CAPTCHA_INPUT_SELECTOR = 'input[name*="captcha"], input[id*="captcha"], input[placeholder*="captcha"], input[aria-label*="captcha"]'
+_CAPTCHA_LABEL_SELECTOR = 'label[for*="captcha"], div[class*="captcha"], p[class*="captcha"]'
+_ERROR_SELECTOR = '.error, .alert, .message, [role="alert"], [class*="error"], [class*="alert"]'
+_ACCOUNT_SELECTOR = '[class*="account"], [class*="user"], [class*="profile"], [class*="my-"]'
+
+_CONSENT_KEYWORDS = ('cookie', 'aceitar', 'accept', 'consent')
+_LOGIN_BUTTON_KEYWORDS = ('login', 'entrar', 'sign in', 'log in', 'submit')
+_CAPTCHA_TEXT_KEYWORDS = ('captcha', 'security check', 'verificação de segurança', 'texto da imagem', 'human')
+
+# 아래 JS는 모듈 로드 시 한 번만 만들어 재사용합니다. (선택자/키워드는 JSON으로 넣어 따옴표 이스케이프 문제를 피함)
+_js = json.dumps
+
+
+def _js_keyword_regex(keywords) -> str:
+    """키워드 중 하나라도 포함되면 일치하는 대소문자 무시 JS 정규식 리터럴을 만듭니다."""
+    return "/" + "|".join(re.sub(r"([.*+?^${}()|\[\]\\/])", r"\\\1", keyword) for keyword in keywords) + "/i"
+
+# 여러 요소의 DOM 인덱스(document.querySelectorAll('*') 기준)를 계산하는 JS 함수.
+# 요소마다 전체 DOM을 다시 훑지 않고, 문서 순서로 한 번만 순회하며 마지막 대상을 찾으면 중단합니다.
+_INDEX_OF_ALL_JS = """
+        const indexOfAll = (targets) => {
+            const indices = new Map();
+            for (const el of targets) {
+                if (el) indices.set(el, -1);
+            }
+            let remaining = indices.size;
+            const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT);
+            for (let i = 0, node = walker.currentNode; node && remaining > 0; node = walker.nextNode(), i++) {
+                if (indices.get(node) === -1) {
+                    indices.set(node, i);
+                    remaining--;
+                }
+            }
+            return targets.map(el => el ? indices.get(el) : -1);
+        };
+"""
+
+# 로그인 페이지 탐색 JS: 쿠키 동의 버튼, 사용자명/비밀번호 필드, 제출 버튼의 DOM 인덱스와
+# CAPTCHA 감지 결과를 한 번의 evaluate 호출로 반환합니다.
+_SCAN_JS = """
+    () => {""" + _INDEX_OF_ALL_JS + """
+        // 키워드 정규식 (요소마다 키워드별 includes를 반복하지 않고 한 번에 검사)
+        const CONSENT_RX = """ + _js_keyword_regex(_CONSENT_KEYWORDS) + """;
+        const LOGIN_BUTTON_RX = """ + _js_keyword_regex(_LOGIN_BUTTON_KEYWORDS) + """;
+        const CAPTCHA_TEXT_RX = """ + _js_keyword_regex(_CAPTCHA_TEXT_KEYWORDS) + """;
+        
+        // 쿠키 동의 버튼 (다른 페이지로 이동하는 링크 안의 요소는 제외)
+        const navigates = (el) => {
+            const link = el.closest('a[href]');
+            if (!link) return false;
+            const href = link.getAttribute('href').trim();
+            return href !== '' && href !== '#' && !/^javascript:/i.test(href);
+        };
+        const consent = Array.from(document.querySelectorAll(""" + _js(_CONSENT_BUTTON_SELECTOR) + """))
+            .find(el => !navigates(el) && CONSENT_RX.test(el.textContent || el.value || ''));
+        
+        // 로그인 폼 요소
+        const username = document.querySelector(""" + _js(_USERNAME_SELECTOR) + """);
+        const password = document.querySelector(""" + _js(_PASSWORD_SELECTOR) + """);
+        
+        // 로그인 버튼 검색 (선택자로 찾지 못하면 텍스트로 찾기)
+        let submit = document.querySelector(""" + _js(_SUBMIT_SELECTOR) + """);
+        if (!submit) {
+            submit = Array.from(document.querySelectorAll(""" + _js(_BUTTON_SELECTOR) + """))
+                .find(btn => LOGIN_BUTTON_RX.test(btn.textContent));
+        }
+        
+        // CAPTCHA 관련 요소 및 텍스트 탐지
+        const captchaElements = document.querySelectorAll(""" + _js(_CAPTCHA_SELECTOR) + """);
+        const hasCaptchaText = CAPTCHA_TEXT_RX.test(document.body.textContent);
+        
+        const [consentIdx, usernameIdx, passwordIdx, submitIdx] = indexOfAll([consent, username, password, submit]);
+        
+        return {
+            consentIdx,
+            usernameIdx,
+            passwordIdx,
+            submitIdx,
+            captcha: {
+                has_elements: captchaElements.length > 0,
+                has_text: hasCaptchaText,
+                element_count: captchaElements.length
+            },
+            url: window.location.href
+        };
+    }
+"""
+
+# CAPTCHA 감지 후 이미지/입력 필드 인덱스와 안내 문구를 한 번에 조회하는 JS
+_CAPTCHA_SCAN_JS = """
+    () => {""" + _INDEX_OF_ALL_JS + """
+        const captchaImg = document.querySelector(""" + _js(_CAPTCHA_IMAGE_SELECTOR) + """);
+        const captchaInput = document.querySelector(""" + _js(_CAPTCHA_INPUT_SELECTOR) + """);
+        const [imageIdx, inputIdx] = indexOfAll([captchaImg, captchaInput]);
+        
+        // CAPTCHA 가이드 메시지
+        let message = null;
+        for (const label of document.querySelectorAll(""" + _js(_CAPTCHA_LABEL_SELECTOR) + """)) {
+            if (label.textContent.trim()) {
+                message = label.textContent.trim();
+                break;
+            }
+        }
+        
+        return { imageIdx, inputIdx, message };
+    }
+"""
+
+# 로그인 관련 요소(로그인 폼, 사용자명/비밀번호 필드)가 없는지 확인하는 JS 식
+_NO_LOGIN_ELEMENTS_JS = (
+    "!document.querySelector(" + _js(_LOGIN_FORM_SELECTOR) + ")"
+    " && !document.querySelector(" + _js(_USERNAME_CHECK_SELECTOR) + ")"
+    " && !document.querySelector(" + _js(_PASSWORD_SELECTOR) + ")"
+)
+
+# 쿠키 로그인 후 로그인 상태 확인 JS (로그인 관련 요소가 없으면 로그인 상태로 간주)
+_COOKIE_LOGGED_IN_JS = "() => " + _NO_LOGIN_ELEMENTS_JS
+
+# 폼 로그인 후 로그인 상태 확인 JS (로그인 요소가 없거나 사용자 계정 관련 요소가 있으면 로그인 상태로 간주)
+_FORM_LOGGED_IN_JS = (
+    "() => (" + _NO_LOGIN_ELEMENTS_JS + ")"
+    " || document.querySelectorAll(" + _js(_ACCOUNT_SELECTOR) + ").length > 0"
+)
+
+# 로그인 오류 메시지 조회 JS
+_ERROR_MESSAGE_JS = """
+    () => {
+        for (const el of document.querySelectorAll(""" + _js(_ERROR_SELECTOR) + """)) {
+            if (el.textContent.trim()) {
+                return el.textContent.trim();
+            }
+        }
+        return null;
+    }
+"""
+
+_CURRENT_URL_JS = "() => window.location.href"
+
 class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
     """
     CAPTCHA 우회를 위한 확장 브라우저 도구입니다.
@@ -23,6 +238,28 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
         self.user_agent = user_agent
         self.cookies_dir = '/workspace/browser_cookies'
         self.screenshots_dir = '/workspace/screenshots'
+        # 진행 중인 샌드박스 초기화 작업 (동시 호출이 같은 초기화를 공유)
+        self._sandbox_init = None
+        # 요소 이미지 해시 → OCR 텍스트 (같은 CAPTCHA 이미지를 다시 인식하지 않도록 캐시)
+        self._ocr_cache: OrderedDict = OrderedDict()
+    
+    async def _ensure_sandbox(self) -> Sandbox:
+        """
+        샌드박스를 한 번만 초기화합니다.
+        
+        초기화가 끝난 뒤에는 바로 반환하고, 초기화 도중 들어온 호출은 같은 작업을 기다립니다.
+        초기화가 실패하면 다음 호출에서 다시 시도합니다.
+        """
+        if self._sandbox is not None:
+            return self._sandbox
+        
+        if self._sandbox_init is None:
+            self._sandbox_init = asyncio.ensure_future(super()._ensure_sandbox())
+        try:
+            return await asyncio.shield(self._sandbox_init)
+        except Exception:
+            self._sandbox_init = None
+            raise
     
     async def _setup_browser_config(self):
         """
@@ -35,16 +272,10 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             os.makedirs(self.cookies_dir, exist_ok=True)
             os.makedirs(self.screenshots_dir, exist_ok=True)
             
-            # 브라우저 설정 구성
-            config = {
-                "headless": self.is_headless
-            }
-            
+            # 브라우저 설정 구성 (UA를 지정한 경우에만 기본 설정을 복사)
+            config = _BASE_BROWSER_CONFIGS[bool(self.is_headless)]
             if self.user_agent:
-                config["userAgent"] = self.user_agent
-            else:
-                # 일반적인 데스크탑 브라우저 UA 설정
-                config["userAgent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+                config = {**config, "userAgent": self.user_agent}
             
             # 브라우저 설정 적용
             result = await self._execute_browser_action("set_browser_config", config)
@@ -160,8 +391,7 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             cookies = cookies_result.get("data", {}).get("cookies", [])
             
             # 쿠키 파일 저장
-            with open(filepath, 'w') as f:
-                json.dump(cookies, f)
+            _write_bytes(filepath, _dumps(cookies))
             
             return self.success_response({
                 "message": f"쿠키가 성공적으로 저장되었습니다.",
@@ -214,13 +444,12 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
         try:
             await self._ensure_sandbox()
             
-            if not os.path.exists(filepath):
+            # 쿠키 파일 로드 (존재 여부를 따로 확인하지 않고 열기 실패로 판단)
+            try:
+                cookies = _loads(_read_bytes(filepath))
+            except FileNotFoundError:
                 return self.fail_response(f"쿠키 파일을 찾을 수 없습니다: {filepath}")
             
-            # 쿠키 파일 로드
-            with open(filepath, 'r') as f:
-                cookies = json.load(f)
-            
             # 쿠키 설정
             result = await self._execute_browser_action("set_cookies", {"cookies": cookies})
             
@@ -413,7 +642,7 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
                     },
                     "filename": {
                         "type": "string",
-                        "description": "저장할 파일명 (기본값: captcha_날짜시간.png)"
+                        "description": "저장할 파일명 (기본값: captcha_타임스탬프.png)"
                     }
                 },
                 "required": ["index"]
@@ -438,7 +667,7 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
         
         Args:
             index (int): CAPTCHA 요소의 인덱스
-            filename (str, optional): 저장할 파일명 (기본값: captcha_날짜시간.png)
+            filename (str, optional): 저장할 파일명 (기본값: captcha_타임스탬프.png)
             
         Returns:
             ToolResult: 스크린샷 결과
@@ -447,7 +676,7 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             await self._ensure_sandbox()
             
             if not filename:
-                filename = f"captcha_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+                filename = f"captcha_{time.time_ns()}.png"
             
             filepath = os.path.join(self.screenshots_dir, filename)
             
@@ -468,6 +697,26 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             logger.error(f"CAPTCHA 스크린샷 오류: {str(e)}")
             return self.fail_response(f"CAPTCHA 스크린샷 오류: {str(e)}")
 
+    async def _element_image_hash(self, index: int):
+        """
+        요소 스크린샷의 해시를 계산합니다. 스크린샷을 얻지 못하면 None을 반환합니다.
+        """
+        try:
+            filepath = os.path.join(self.screenshots_dir, f"ocr_element_{index}.png")
+            result = await self._execute_browser_action("take_element_screenshot", {
+                "index": index,
+                "path": filepath
+            })
+            if not result.get("success", False):
+                return None
+            
+            # 샌드박스 파일 다운로드는 동기 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+            image_bytes = await asyncio.to_thread(self.sandbox.fs.download_file, filepath)
+            return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+        except Exception as e:
+            logger.debug(f"OCR 캐시용 요소 스크린샷 실패 (캐시 없이 진행): {str(e)}")
+            return None
+
     @openapi_schema({
         "type": "function",
         "function": {
@@ -509,6 +758,15 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
         try:
             await self._ensure_sandbox()
             
+            # 요소 이미지가 이전에 인식한 것과 같으면 OCR 없이 캐시된 텍스트 반환
+            image_hash = await self._element_image_hash(index)
+            if image_hash is not None and image_hash in self._ocr_cache:
+                self._ocr_cache.move_to_end(image_hash)
+                return self.success_response({
+                    "message": "OCR 인식 성공 (캐시)",
+                    "text": self._ocr_cache[image_hash]
+                })
+            
             result = await self._execute_browser_action("ocr_element", {"index": index})
             
             if not result.get("success", False):
@@ -516,6 +774,11 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             
             ocr_text = result.get("data", {}).get("text", "")
             
+            if image_hash is not None:
+                self._ocr_cache[image_hash] = ocr_text
+                if len(self._ocr_cache) > _OCR_CACHE_MAX_ENTRIES:
+                    self._ocr_cache.popitem(last=False)
+            
             return self.success_response({
                 "message": "OCR 인식 성공",
                 "text": ocr_text
@@ -630,21 +893,11 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
                     await self.browser_navigate_to(url)
                     await self.browser_wait(5)
                     
-                    # 로그인 상태 확인
-                    current_url = await self.browser.evaluate("() => window.location.href")
-                    
-                    # 쿠키로 로그인 성공 여부 확인 (URL 변경 또는 로그인 요소 부재로 확인)
-                    is_logged_in = await self.browser.evaluate("""
-                        () => {
-                            // 로그인 폼 요소가 없으면 로그인된 것으로 간주
-                            const loginForm = document.querySelector('form[action*="login"], form[id*="login"], form[class*="login"]');
-                            const usernameField = document.querySelector('input[type="email"], input[type="text"][name*="user"], input[type="text"][name*="email"]');
-                            const passwordField = document.querySelector('input[type="password"]');
-                            
-                            // 로그인 관련 요소가 없으면 로그인 상태로 간주
-                            return !loginForm && !usernameField && !passwordField;
-                        }
-                    """)
+                    # 로그인 상태 확인: 현재 URL과 로그인 요소 부재 여부를 동시에 조회
+                    current_url, is_logged_in = await asyncio.gather(
+                        self.browser.evaluate(_CURRENT_URL_JS),
+                        self.browser.evaluate(_COOKIE_LOGGED_IN_JS)
+                    )
                     
                     if is_logged_in:
                         return self.success_response({
@@ -660,80 +913,24 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             await self.browser_navigate_to(url)
             await self.browser_wait(5)
             
-            # 쿠키 동의 버튼 처리 (있는 경우)
-            try:
-                cookie_consent = await self.browser.evaluate("""
-                    () => {
-                        const cookieButtons = Array.from(document.querySelectorAll('button, a'))
-                            .filter(el => {
-                                const text = el.textContent.toLowerCase();
-                                return text.includes('cookie') || text.includes('aceitar') || 
-                                       text.includes('accept') || text.includes('consent');
-                            });
-                        return cookieButtons.length > 0 ? cookieButtons[0] : null;
-                    }
-                """)
-                
-                if cookie_consent:
-                    cookie_button_index = await self.browser.evaluate("""
-                        () => {
-                            const elements = document.querySelectorAll('*');
-                            const cookieButton = document.querySelector('button, a').filter(el => {
-                                const text = el.textContent.toLowerCase();
-                                return text.includes('cookie') || text.includes('aceitar') || 
-                                       text.includes('accept') || text.includes('consent');
-                            })[0];
-                            
-                            for (let i = 0; i < elements.length; i++) {
-                                if (elements[i] === cookieButton) {
-                                    return i;
-                                }
-                            }
-                            return -1;
-                        }
-                    """)
-                    
-                    if cookie_button_index >= 0:
-                        await self.browser_click_element(cookie_button_index)
-                        await self.browser_wait(2)
-                        
-            except Exception as e:
-                logger.warning(f"쿠키 동의 버튼 처리 오류 (무시됨): {str(e)}")
-            
-            # 5. 로그인 폼 요소 탐색
-            # 사용자명 필드 찾기
-            username_field_index = await self.browser.evaluate("""
-                () => {
-                    const elements = document.querySelectorAll('*');
-                    const usernameField = document.querySelector('input[type="email"], input[type="text"][name*="user"], input[type="text"][name*="email"], input[type="text"][id*="user"], input[type="text"][id*="email"]');
-                    
-                    for (let i = 0; i < elements.length; i++) {
-                        if (elements[i] === usernameField) {
-                            return i;
-                        }
-                    }
-                    return -1;
-                }
-            """)
+            # 로그인 페이지 요소를 한 번에 탐색
+            probe = await self.browser.evaluate(_SCAN_JS)
+            
+            # 쿠키 동의 버튼 처리 (있는 경우, 클릭 후 DOM이 바뀌므로 다시 탐색)
+            if probe["consentIdx"] >= 0:
+                try:
+                    await self.browser_click_element(probe["consentIdx"])
+                    await self.browser_wait(2)
+                    probe = await self.browser.evaluate(_SCAN_JS)
+                except Exception as e:
+                    logger.warning(f"쿠키 동의 버튼 처리 오류 (무시됨): {str(e)}")
             
+            # 5. 로그인 폼 요소 확인
+            username_field_index = probe["usernameIdx"]
             if username_field_index < 0:
                 return self.fail_response("사용자명 입력 필드를 찾을 수 없습니다.")
             
-            # 비밀번호 필드 찾기
-            password_field_index = await self.browser.evaluate("""
-                () => {
-                    const elements = document.querySelectorAll('*');
-                    const passwordField = document.querySelector('input[type="password"]');
-                    
-                    for (let i = 0; i < elements.length; i++) {
-                        if (elements[i] === passwordField) {
-                            return i;
-                        }
-                    }
-                    return -1;
-                }
-            """)
-            
+            password_field_index = probe["passwordIdx"]
             if password_field_index < 0:
                 return self.fail_response("비밀번호 입력 필드를 찾을 수 없습니다.")
             
@@ -751,64 +948,10 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             
             await self.browser_wait(2)
             
-            # 7. CAPTCHA 요소 확인
-            captcha_exists = await self.browser.evaluate("""
-                () => {
-                    // CAPTCHA 관련 요소 탐지
-                    const captchaElements = document.querySelectorAll('iframe[src*="recaptcha"], iframe[src*="captcha"], img[alt*="captcha"], div.captcha, div[class*="captcha"]');
-                    
-                    // CAPTCHA 관련 텍스트 확인
-                    const body = document.body.textContent.toLowerCase();
-                    const hasCaptchaText = body.includes('captcha') || 
-                                        body.includes('security check') || 
-                                        body.includes('verificação de segurança') ||
-                                        body.includes('texto da imagem') ||
-                                        body.includes('human');
-                    
-                    return {
-                        has_elements: captchaElements.length > 0,
-                        has_text: hasCaptchaText,
-                        element_count: captchaElements.length
-                    };
-                }
-            """)
-            
-            # 8. 제출 버튼 찾기
-            submit_button_index = await self.browser.evaluate("""
-                () => {
-                    const elements = document.querySelectorAll('*');
-                    
-                    // 로그인 버튼 검색 (여러 선택자 시도)
-                    const submitButton = document.querySelector('button[type="submit"], input[type="submit"], button[name*="login"], button[id*="login"], button.login, a.login-button, a[href*="login"]');
-                    
-                    if (!submitButton) {
-                        // 텍스트로 버튼 찾기
-                        const buttons = Array.from(document.querySelectorAll('button, input[type="button"], a.btn, a.button, [role="button"]'));
-                        const loginButton = buttons.find(btn => {
-                            const text = btn.textContent.toLowerCase();
-                            return text.includes('login') || text.includes('entrar') || 
-                                  text.includes('sign in') || text.includes('log in') ||
-                                  text.includes('submit');
-                        });
-                        
-                        if (loginButton) {
-                            for (let i = 0; i < elements.length; i++) {
-                                if (elements[i] === loginButton) {
-                                    return i;
-                                }
-                            }
-                        }
-                        return -1;
-                    }
-                    
-                    for (let i = 0; i < elements.length; i++) {
-                        if (elements[i] === submitButton) {
-                            return i;
-                        }
-                    }
-                    return -1;
-                }
-            """)
+            # 7. CAPTCHA 확인 및 8. 제출 버튼 찾기 (입력 후 나타나는 CAPTCHA가 있으므로 다시 탐색)
+            probe = await self.browser.evaluate(_SCAN_JS)
+            captcha_exists = probe["captcha"]
+            submit_button_index = probe["submitIdx"]
             
             if submit_button_index < 0:
                 return self.fail_response("로그인 제출 버튼을 찾을 수 없습니다.")
@@ -818,58 +961,17 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
                 logger.warning("CAPTCHA가 감지되었습니다. 우회를 시도합니다.")
                 
                 # 페이지 스크린샷 저장
-                screenshot_path = os.path.join(self.screenshots_dir, f"captcha_page_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+                screenshot_path = os.path.join(self.screenshots_dir, f"captcha_page_{time.time_ns()}.png")
                 await self.browser.screenshot(path=screenshot_path)
                 
                 # 추가 대기 시간 도입 (자동화 감지 회피)
                 await self.browser_wait(3)
                 
-                # CAPTCHA 이미지 찾기 시도
-                captcha_image_index = await self.browser.evaluate("""
-                    () => {
-                        const elements = document.querySelectorAll('*');
-                        const captchaImg = document.querySelector('img[alt*="captcha"], img[src*="captcha"], iframe[src*="captcha"]');
-                        
-                        if (captchaImg) {
-                            for (let i = 0; i < elements.length; i++) {
-                                if (elements[i] === captchaImg) {
-                                    return i;
-                                }
-                            }
-                        }
-                        return -1;
-                    }
-                """)
-                
-                # CAPTCHA 입력 필드 찾기 시도
-                captcha_input_index = await self.browser.evaluate("""
-                    () => {
-                        const elements = document.querySelectorAll('*');
-                        const captchaInput = document.querySelector('input[name*="captcha"], input[id*="captcha"], input[placeholder*="captcha"], input[aria-label*="captcha"]');
-                        
-                        if (captchaInput) {
-                            for (let i = 0; i < elements.length; i++) {
-                                if (elements[i] === captchaInput) {
-                                    return i;
-                                }
-                            }
-                        }
-                        return -1;
-                    }
-                """)
-                
-                # CAPTCHA 가이드 메시지 확인
-                captcha_message = await self.browser.evaluate("""
-                    () => {
-                        const captchaLabels = document.querySelectorAll('label[for*="captcha"], div[class*="captcha"], p[class*="captcha"]');
-                        for (const label of captchaLabels) {
-                            if (label.textContent.trim()) {
-                                return label.textContent.trim();
-                            }
-                        }
-                        return null;
-                    }
-                """)
+                # CAPTCHA 이미지/입력 필드 인덱스와 가이드 메시지 확인
+                captcha_info = await self.browser.evaluate(_CAPTCHA_SCAN_JS)
+                captcha_image_index = captcha_info["imageIdx"]
+                captcha_input_index = captcha_info["inputIdx"]
+                captcha_message = captcha_info["message"]
                 
                 return self.success_response({
                     "message": "로그인 시도 중 CAPTCHA 감지됨",
@@ -886,45 +988,16 @@ class SandboxBrowserCaptchaBypass(SandboxBrowserTool):
             await self.browser_click_element(submit_button_index)
             await self.browser_wait(5)
             
-            # 11. 로그인 결과 확인
-            current_url = await self.browser.evaluate("() => window.location.href")
-            
-            # 로그인 실패 메시지 확인
-            error_message = await self.browser.evaluate("""
-                () => {
-                    // 오류 메시지 찾기
-                    const errorElements = document.querySelectorAll('.error, .alert, .message, [role="alert"], [class*="error"], [class*="alert"]');
-                    for (const el of errorElements) {
-                        if (el.textContent.trim()) {
-                            return el.textContent.trim();
-                        }
-                    }
-                    return null;
-                }
-            """)
+            # 11. 로그인 결과 확인: 현재 URL, 실패 메시지, 로그인 상태를 동시에 조회
+            current_url, error_message, is_logged_in = await asyncio.gather(
+                self.browser.evaluate(_CURRENT_URL_JS),
+                self.browser.evaluate(_ERROR_MESSAGE_JS),
+                self.browser.evaluate(_FORM_LOGGED_IN_JS)
+            )
             
             if error_message:
                 return self.fail_response(f"로그인 실패: {error_message}")
             
-            # 로그인 성공 확인
-            is_logged_in = await self.browser.evaluate("""
-                () => {
-                    // 로그인 폼 요소가 없으면 로그인된 것으로 간주
-                    const loginForm = document.querySelector('form[action*="login"], form[id*="login"], form[class*="login"]');
-                    const usernameField = document.querySelector('input[type="email"], input[type="text"][name*="user"], input[type="text"][name*="email"]');
-                    const passwordField = document.querySelector('input[type="password"]');
-                    
-                    // 로그인 관련 요소가 없으면 로그인 상태로 간주
-                    const noLoginElements = !loginForm && !usernameField && !passwordField;
-                    
-                    // 사용자 계정 관련 요소 확인
-                    const accountElements = document.querySelectorAll('[class*="account"], [class*="user"], [class*="profile"], [class*="my-"]');
-                    const hasAccountElements = accountElements.length > 0;
-                    
-                    return noLoginElements || hasAccountElements;
-                }
-            """)
-            
             if is_logged_in:
                 # 로그인 성공 시 쿠키 저장
                 await self.browser_save_cookies(domain, cookies_filename)
@@ -39,7 +39,7 @@ class SandboxBrowserTool(SandboxToolsBase):
             else:
                 curl_cmd = f"curl -s -X {method} '{url}' -H 'Content-Type: application/json'"
                 if params:
-                    json_data = json.dumps(params)
+                    json_data = json.dumps(params, separators=(",", ":"))
                     curl_cmd += f" -d '{json_data}'"
             
             logger.debug("\033[95mExecuting curl command:\033[0m")
@@ -0,0 +1,21 @@
+import os
+
+# utils.config는 필수 설정이 없으면 import 시점에 실패하므로, 테스트에서는 외부 서비스에 연결하지 않는
+# 더미 값을 기본값으로 넣어 둠 (환경 변수에 이미 값이 있으면 그대로 사용)
+_CONFIG_DEFAULTS = {
+    "ANTHROPIC_API_KEY": "test",
+    "SUPABASE_URL": "http://localhost:54321",
+    "SUPABASE_ANON_KEY": "test",
+    "SUPABASE_SERVICE_ROLE_KEY": "test",
+    "REDIS_HOST": "localhost",
+    "REDIS_PASSWORD": "test",
+    "DAYTONA_API_KEY": "test",
+    "DAYTONA_SERVER_URL": "http://localhost:3000",
+    "DAYTONA_TARGET": "us",
+    "TAVILY_API_KEY": "test",
+    "RAPID_API_KEY": "test",
+    "FIRECRAWL_API_KEY": "test",
+}
+
+for key, value in _CONFIG_DEFAULTS.items():
+    os.environ.setdefault(key, value)
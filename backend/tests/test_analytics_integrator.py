@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+pytest.importorskip("google.cloud.bigquery_storage")
+
+from analytics_integrator import AnalyticsIntegrator
+
+
+ANALYTICS_ROWS = [
+    {"kind": "bounce", "row_num": 1, "page_path": "/login", "sessions": None, "users": None,
+     "avg_time_seconds": None, "events": None, "bounce_rate": 0.62},
+    {"kind": "ga", "row_num": 1, "page_path": "/login", "sessions": 120, "users": 80,
+     "avg_time_seconds": 12.5, "events": 900, "bounce_rate": None},
+    {"kind": "ga", "row_num": 2, "page_path": "/login/help", "sessions": 10, "users": 9,
+     "avg_time_seconds": 40.0, "events": 30, "bounce_rate": None},
+    {"kind": "time", "row_num": 1, "page_path": "/login/help", "sessions": None, "users": None,
+     "avg_time_seconds": 40.0, "events": None, "bounce_rate": None},
+    {"kind": "time", "row_num": 2, "page_path": "/login", "sessions": None, "users": None,
+     "avg_time_seconds": 12.5, "events": None, "bounce_rate": None},
+]
+
+
+@pytest.fixture
+def integrator(monkeypatch):
+    # BigQuery 클라이언트를 만들지 않도록 __init__을 거치지 않고 생성
+    integrator = AnalyticsIntegrator.__new__(AnalyticsIntegrator)
+    integrator.project_id = "test-project"
+    calls = []
+
+    async def query_analytics_data(query, params=None):
+        calls.append((query, params))
+        return {"success": True, "data": [dict(row) for row in ANALYTICS_ROWS]}
+
+    monkeypatch.setattr(integrator, "query_analytics_data", query_analytics_data)
+    integrator.calls = calls
+    return integrator
+
+
+@pytest.mark.asyncio
+async def test_compare_runs_one_merged_query(integrator):
+    await integrator.compare_user_journey_with_analytics({"duration": 10}, "/login")
+
+    assert len(integrator.calls) == 1
+    query, params = integrator.calls[0]
+    # events_* 샤드는 base CTE에서 한 번만 스캔
+    assert query.count("analytics_data.events_*") == 1
+    # 경로 값은 SQL에 넣지 않고 매개변수로 전달
+    assert "/login" not in query
+    assert {param.name: param.value for param in params}["path_prefix"] == "/login"
+
+
+@pytest.mark.asyncio
+async def test_compare_splits_rows_per_kind(integrator):
+    result = await integrator.compare_user_journey_with_analytics({"duration": 10}, "/login")
+
+    analytics = result["comparison"]["analytics"]
+    assert analytics["ga_data"] == [
+        {"page_path": "/login", "sessions": 120, "users": 80, "avg_time_seconds": 12.5, "events": 900},
+        {"page_path": "/login/help", "sessions": 10, "users": 9, "avg_time_seconds": 40.0, "events": 30},
+    ]
+    assert analytics["time_data"] == [
+        {"page_path": "/login/help", "avg_time_seconds": 40.0},
+        {"page_path": "/login", "avg_time_seconds": 12.5},
+    ]
+    assert analytics["bounce_data"] == [{"page_path": "/login", "bounce_rate": 0.62}]
+
+
+@pytest.mark.asyncio
+async def test_compare_insights_use_first_row_of_each_kind(integrator):
+    result = await integrator.compare_user_journey_with_analytics({"duration": 10}, "/login")
+
+    insights = {insight["type"]: insight for insight in result["comparison"]["insights"]}
+    # 가장 긴 평균 체류 시간(40초)의 절반보다 짧은 여정
+    assert insights["time_insight"]["severity"] == "medium"
+    assert insights["bounce_insight"]["severity"] == "high"
+
+
+@pytest.mark.asyncio
+async def test_compare_without_rows_has_no_insights(integrator, monkeypatch):
+    async def empty(query, params=None):
+        return {"success": True, "data": []}
+
+    monkeypatch.setattr(integrator, "query_analytics_data", empty)
+    result = await integrator.compare_user_journey_with_analytics({"duration": 10}, "/login")
+
+    analytics = result["comparison"]["analytics"]
+    assert analytics == {"ga_data": [], "time_data": [], "bounce_data": []}
+    assert result["comparison"]["insights"] == []
@@ -0,0 +1,133 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("rapidfuzz")
+pytest.importorskip("google.cloud.bigquery")
+
+from rapidfuzz import fuzz, utils
+
+from bigquery_tool import _QUERY_KEYWORDS, BigQueryTool, _as_bool, _build_keyword_matcher, _keyword_labels
+
+
+KEYWORDS = utils.default_process("user purchase revenue")
+
+FIELD_NAMES = [
+    ("user_id", "unique user identifier"),
+    ("purchase_revenue", "revenue of the purchase in usd"),
+    ("event_name", ""),
+    ("user_pseudo_id", "pseudonymous user id"),
+    ("revenue", ""),
+    ("geo_country", "country of the user"),
+    ("purchase", "purchase event flag"),
+    ("device_category", ""),
+]
+
+FIELDS = [
+    {"name_lc": utils.default_process(name), "description_lc": utils.default_process(desc)}
+    for name, desc in FIELD_NAMES
+]
+
+NAMES = [field["name_lc"] for field in FIELDS]
+
+
+def _reference_field_scores():
+    """필드별 점수를 scorer를 한 건씩 호출해 계산 (이름 0.7 + 설명 0.3, 설명이 없으면 이름 점수)"""
+    scores = []
+    for field in FIELDS:
+        name_score = fuzz.token_set_ratio(KEYWORDS, field["name_lc"])
+        if field["description_lc"]:
+            desc_score = fuzz.token_set_ratio(KEYWORDS, field["description_lc"])
+            scores.append(name_score * 0.7 + desc_score * 0.3)
+        else:
+            scores.append(name_score)
+    return scores
+
+
+@pytest.mark.parametrize("value, expected", [
+    (True, True),
+    (False, False),
+    (None, False),
+    (1, True),
+    (0, False),
+    ("true", True),
+    ("True", True),
+    (" yes ", True),
+    ("1", True),
+    ("false", False),
+    ("False", False),
+    ("0", False),
+    ("no", False),
+    ("", False),
+])
+def test_as_bool_parses_include_details(value, expected):
+    assert _as_bool(value) is expected
+
+
+def test_keyword_scores_match_scorer_without_rounding():
+    scores = BigQueryTool._keyword_scores(KEYWORDS, NAMES)
+
+    assert scores.dtype == np.float64
+    for name, score in zip(NAMES, scores):
+        assert score == fuzz.token_set_ratio(KEYWORDS, name)
+
+
+@pytest.mark.parametrize("cutoff", [0, 40, 55.5, 70])
+def test_keyword_scores_cutoff_matches_scorer(cutoff):
+    scores = BigQueryTool._keyword_scores(KEYWORDS, NAMES, cutoff)
+
+    for name, score in zip(NAMES, scores):
+        expected = fuzz.token_set_ratio(KEYWORDS, name)
+        assert score == (expected if expected >= cutoff else 0)
+
+
+def test_keyword_scores_empty_choices():
+    assert len(BigQueryTool._keyword_scores(KEYWORDS, [])) == 0
+
+
+@pytest.mark.parametrize("min_similarity", [30, 50, 60, 75])
+def test_score_fields_threshold_parity(min_similarity):
+    reference = _reference_field_scores()
+    expected = sorted(
+        (i for i, score in enumerate(reference) if score >= min_similarity),
+        key=lambda i: -reference[i]
+    )
+
+    result = BigQueryTool._score_fields(KEYWORDS, FIELDS, min_similarity, limit=len(FIELDS))
+
+    assert [index for index, _ in result] == expected
+    for index, score in result:
+        assert score == pytest.approx(reference[index])
+
+
+def test_score_fields_limit_keeps_top_scores():
+    reference = _reference_field_scores()
+    top = sorted(range(len(FIELDS)), key=lambda i: -reference[i])[:2]
+
+    result = BigQueryTool._score_fields(KEYWORDS, FIELDS, 0, limit=2)
+
+    assert [index for index, _ in result] == top
+
+
+@pytest.mark.parametrize("text", [
+    "last 30 days daily total",
+    "연간 매출 합계",
+    "top 10 products by month",
+    "monthly count of sessions",
+    "per day average revenue",
+    "recent years lowest",
+    "nothing here",
+    "",
+])
+def test_keyword_labels_match_substring_search(text):
+    expected = {label for label, keywords in _QUERY_KEYWORDS.items() if any(k in text for k in keywords)}
+
+    assert _keyword_labels(text) == expected
+
+
+def test_keyword_matcher_expands_nested_keywords():
+    pattern, labels = _build_keyword_matcher({"outer": ("days",), "inner": ("day",)})
+
+    # 가장 긴 "days"만 매치되어도 그 안의 "day" 라벨까지 포함
+    assert [match.group(1) for match in pattern.finditer("days")] == ["days"]
+    assert labels["days"] == {"outer", "inner"}
+    assert labels["day"] == {"inner"}
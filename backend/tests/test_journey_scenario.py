@@ -0,0 +1,187 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import journey_scenario
+from journey_scenario import _CLICK_JS, _INPUT_JS, _PAGE_IDLE_JS, JourneyScenario, _js_call
+
+
+TRICKY_ARGS = [
+    "#login",
+    'input[name="email"]',
+    "it's \\ back\\slash",
+    "</script><script>alert(1)</script>",
+    "줄\n바꿈\t탭   ${template}",
+    "`backtick`",
+    True,
+    1500,
+    None,
+]
+
+
+def test_js_call_encodes_args_as_json():
+    identity = "(...args) => args"
+    script = _js_call(identity, *TRICKY_ARGS)
+
+    prefix = f"() => ({identity})("
+    assert script.startswith(prefix) and script.endswith(")")
+    # 인자 목록은 그대로 JSON 배열로 디코딩되어야 함 (인자 값이 스크립트 구문을 바꾸지 않음)
+    assert json.loads("[" + script[len(prefix):-1] + "]") == TRICKY_ARGS
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node가 설치되어 있지 않음")
+@pytest.mark.parametrize("function_js, args", [
+    ("(...args) => args", TRICKY_ARGS),
+    (_CLICK_JS, ["a[href='/x']", True, 1500]),
+    (_INPUT_JS, ["#q", "</script>\"'\\", False, 1500]),
+])
+def test_js_call_is_valid_javascript(function_js, args):
+    script = _js_call(function_js, *args)
+    # 함수 본문은 실행하지 않고 구문 검사만 수행
+    result = subprocess.run(
+        ["node", "--check", "-"], input=f"({script});", capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node가 설치되어 있지 않음")
+def test_js_call_passes_args_unchanged():
+    script = _js_call("(...args) => args", *TRICKY_ARGS)
+    result = subprocess.run(
+        ["node", "-e", f"process.stdout.write(JSON.stringify(({script})()))"],
+        capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout) == TRICKY_ARGS
+
+
+class _FakeBrowser:
+    """browser_evaluate 호출을 기록하고 고정된 결과를 반환하는 브라우저 도구"""
+
+    def __init__(self, result=None):
+        self.result = {"success": True, "message": "ok", "ready": True} if result is None else result
+        self.scripts = []
+
+    async def browser_evaluate(self, script):
+        self.scripts.append(script)
+        return self.result
+
+
+@pytest.fixture
+def browser():
+    return _FakeBrowser()
+
+
+@pytest.fixture
+def scenario(browser):
+    scenario = JourneyScenario(browser)
+    yield scenario
+    scenario.close()
+
+
+def _journal_records(scenario):
+    with open(scenario._journal_path, "rb") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.asyncio
+async def test_journal_redacts_input_text(scenario, browser):
+    await scenario.execute_scenario([
+        {"action": "input", "selector": "#password", "text": "hunter2", "post_delay": 0},
+        {"action": "input", "selector": "#empty", "text": "", "post_delay": 0},
+        {"action": "click", "selector": "#submit", "post_delay": 0},
+    ])
+
+    records = _journal_records(scenario)
+    assert [record["text"] for record in records[:2]] == ["***", ""]
+    assert records[0]["selector"] == "#password"
+    assert "text" not in records[2]
+    with open(scenario._journal_path, "rb") as f:
+        assert b"hunter2" not in f.read()
+    # 브라우저에는 실제 입력값을 전달
+    assert "hunter2" in browser.scripts[0]
+
+
+@pytest.mark.asyncio
+async def test_journal_is_reset_per_scenario(scenario):
+    await scenario.execute_scenario([{"action": "click", "selector": "#a", "post_delay": 0}])
+    await scenario.execute_scenario([{"action": "click", "selector": "#b", "post_delay": 0}])
+
+    assert [record["selector"] for record in _journal_records(scenario)] == ["#b"]
+
+
+@pytest.mark.asyncio
+async def test_close_removes_journal(scenario):
+    await scenario.execute_scenario([{"action": "click", "selector": "#a", "post_delay": 0}])
+    path = scenario._journal_path
+
+    scenario.close()
+
+    assert not os.path.exists(path)
+
+
+class _LoadingBrowser:
+    """처음 몇 번은 로드 중(또는 평가 실패)으로 응답한 뒤 로드 완료를 반환하는 브라우저 도구"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.scripts = []
+
+    async def browser_evaluate(self, script):
+        self.scripts.append(script)
+        response = self.responses.pop(0) if self.responses else {"ready": True}
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def no_poll_delay(monkeypatch):
+    monkeypatch.setattr(journey_scenario, "_READY_POLL_INTERVAL", 0)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_page_idle_polls_until_ready(no_poll_delay):
+    browser = _LoadingBrowser([{"ready": False}, RuntimeError("context destroyed"), {"ready": False}])
+    scenario = JourneyScenario(browser)
+    try:
+        assert await scenario._wait_for_page_idle() is True
+    finally:
+        scenario.close()
+
+    assert browser.scripts == [_js_call(_PAGE_IDLE_JS)] * 4
+
+
+@pytest.mark.asyncio
+async def test_wait_for_page_idle_times_out(no_poll_delay):
+    browser = _LoadingBrowser([{"ready": False}] * 1000)
+    scenario = JourneyScenario(browser)
+    try:
+        assert await scenario._wait_for_page_idle(timeout_ms=0) is False
+    finally:
+        scenario.close()
+
+    assert len(browser.scripts) == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_page_idle_without_evaluate_returns_immediately():
+    scenario = JourneyScenario(object())
+    try:
+        assert await scenario._wait_for_page_idle() is False
+    finally:
+        scenario.close()
+
+
+@pytest.mark.asyncio
+async def test_scenario_waits_for_page_idle_unless_post_delay_is_set(scenario, browser):
+    await scenario.execute_scenario([
+        {"action": "click", "selector": "#a"},
+        {"action": "click", "selector": "#b", "post_delay": 0},
+    ])
+
+    idle_script = _js_call(_PAGE_IDLE_JS)
+    assert [script == idle_script for script in browser.scripts] == [False, True, False]
@@ -0,0 +1,136 @@
+import os
+
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+
+import llm_tool_integration
+from llm_tool_integration import LLMToolIntegration
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(llm_tool_integration.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def integration():
+    return LLMToolIntegration(None, None)
+
+
+def _loader(calls, result):
+    async def load():
+        calls.append(1)
+        return result
+    return load
+
+
+@pytest.mark.asyncio
+async def test_cached_call_returns_cached_copy_within_ttl(integration, clock):
+    cache = {}
+    calls = []
+    result = {"success": True, "rows": [1, 2]}
+
+    first = await integration._cached_call(cache, ("a",), _loader(calls, result))
+    first["rows"].append(3)
+    second = await integration._cached_call(cache, ("a",), _loader(calls, result))
+
+    assert len(calls) == 1
+    assert second == {"success": True, "rows": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_cached_call_reloads_after_ttl(integration, clock):
+    cache = {}
+    calls = []
+
+    await integration._cached_call(cache, ("a",), _loader(calls, {"success": True}))
+    clock.now += integration._cache_ttl
+    await integration._cached_call(cache, ("a",), _loader(calls, {"success": True}))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_call_does_not_cache_failures(integration, clock):
+    cache = {}
+    calls = []
+
+    await integration._cached_call(cache, ("a",), _loader(calls, {"success": False}))
+    await integration._cached_call(cache, ("a",), _loader(calls, {"success": False}))
+
+    assert len(calls) == 2
+    assert cache == {}
+
+
+@pytest.mark.asyncio
+async def test_cached_call_evicts_least_recently_used(integration, clock):
+    integration._cache_max_entries = 2
+    cache = {}
+    calls = []
+
+    await integration._cached_call(cache, ("a",), _loader(calls, {"success": True}))
+    await integration._cached_call(cache, ("b",), _loader(calls, {"success": True}))
+    # a를 다시 사용하면 가장 오래 사용하지 않은 항목은 b
+    await integration._cached_call(cache, ("a",), _loader(calls, {"success": True}))
+    await integration._cached_call(cache, ("c",), _loader(calls, {"success": True}))
+
+    assert list(cache) == [("a",), ("c",)]
+    assert len(calls) == 3
+
+
+@pytest.fixture
+def pooled(integration, monkeypatch):
+    monkeypatch.setattr(llm_tool_integration, "_SCENARIO_POOL_MAX_SIZE", 2)
+    # AnalyticsIntegrator(BigQuery 클라이언트)를 만들지 않도록 미리 채워 둠
+    integration._analytics_integrator = object()
+    yield integration
+    integration.close()
+
+
+def test_scenario_pool_evicts_least_recently_used_idle_session(pooled):
+    a = pooled._get_journey_scenario("a")
+    pooled._get_journey_scenario("b")
+    pooled._get_journey_scenario("a")
+    pooled._get_journey_scenario("c")
+
+    assert list(pooled._scenario_pool) == ["a", "c"]
+    assert pooled._get_journey_scenario("a") is a
+
+
+def test_scenario_pool_keeps_running_sessions(pooled):
+    a = pooled._get_journey_scenario("a")
+    b = pooled._get_journey_scenario("b")
+    a._active_runs = b._active_runs = 1
+
+    pooled._get_journey_scenario("c")
+
+    # 실행 중인 시나리오는 정리하지 않고, 방금 만든 세션도 남김
+    assert list(pooled._scenario_pool) == ["a", "b", "c"]
+    assert os.path.exists(a._journal_path)
+
+    a._active_runs = 0
+    pooled._get_journey_scenario("d")
+
+    # 최대 크기를 넘은 만큼 실행 중이 아닌 세션을 모두 정리
+    assert list(pooled._scenario_pool) == ["b", "d"]
+    assert not os.path.exists(a._journal_path)
+
+
+def test_close_cleans_up_all_scenarios(pooled):
+    journals = [pooled._get_journey_scenario(session_id)._journal_path for session_id in ("a", "b")]
+
+    pooled.close()
+
+    assert not pooled._scenario_pool
+    assert not any(os.path.exists(path) for path in journals)
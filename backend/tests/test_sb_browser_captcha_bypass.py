@@ -0,0 +1,41 @@
+import os
+import stat
+
+import pytest
+
+pytest.importorskip("daytona_sdk")
+
+from agent.tools.sb_browser_captcha_bypass import _read_bytes, _write_bytes
+
+
+def test_write_bytes_round_trip(tmp_path):
+    path = str(tmp_path / "cookies.json")
+    data = b'[{"name": "session", "value": "abc"}]' * 1000
+
+    _write_bytes(path, data)
+
+    assert _read_bytes(path) == data
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(tmp_path) == ["cookies.json"]
+
+
+def test_write_bytes_replaces_existing_file(tmp_path):
+    path = str(tmp_path / "cookies.json")
+
+    _write_bytes(path, b"old contents that are longer")
+    _write_bytes(path, b"new")
+
+    assert _read_bytes(path) == b"new"
+    assert os.listdir(tmp_path) == ["cookies.json"]
+
+
+def test_read_bytes_empty_file(tmp_path):
+    path = str(tmp_path / "empty.json")
+    _write_bytes(path, b"")
+
+    assert _read_bytes(path) == b""
+
+
+def test_read_bytes_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _read_bytes(str(tmp_path / "missing.json"))